@@ -26,6 +26,7 @@ rm -rf $root_dir/dist
 pyinstaller $root_dir/lotto/__main__.py \
   --name $CLI_APP_NAME \
   --exclude-module pyinstaller \
+  --collect-submodules lotto.strategies \
   --distpath $root_dir/dist \
   --workpath $root_dir/build \
   --log-level WARN
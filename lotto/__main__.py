@@ -1,18 +1,11 @@
-import importlib
-import pkgutil
+from multiprocessing import freeze_support
 
-import lotto.strategies.baseline
-import lotto.strategies.hot_numbers  # noqa: F401
 from lotto.cli import run_typer_app
+from lotto.registry import StrategyRegistry
 
-
-def run_modules_discovery(package: str) -> None:
-    package = importlib.import_module(package)
-
-    for _, module_name, _ in pkgutil.walk_packages(package.__path__, package.__name__ + '.'):
-        importlib.import_module(module_name)
-
+# at module level so spawned worker processes, which re-import this module, know the strategies too
+StrategyRegistry.discover()
 
 if __name__ == '__main__':
-    # run_modules_discovery('lotto.strategies')
+    freeze_support()
     run_typer_app()
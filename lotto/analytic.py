@@ -0,0 +1,162 @@
+from math import comb
+
+import numpy as np
+
+from .core import AbstractStrategy, DrawStore, GameBatch, GameType, count_matches, encode_masks
+from .metrics import BacktestReport, BasicMetrics, MetricsCalculator, MonetaryMetrics
+
+_MAX_RUN = 256
+_NEGLIGIBLE = 1e-15
+
+
+class AnalyticEvaluator:
+    def __init__(self, pool_max: int = AbstractStrategy.POOL_MAX, take: int = AbstractStrategy.TAKE) -> None:
+        self._take = take
+        self._probabilities = np.array(
+            [comb(take, k) * comb(pool_max - take, take - k) / comb(pool_max, take) for k in range(take + 1)]
+        )
+
+    @property
+    def match_probabilities(self) -> np.ndarray:
+        return self._probabilities
+
+    # `drawn` is how many of the draws had a result for the game, the rest are paid for like the backtest does
+    # but can't match anything - Lotto Plus only exists for part of the history
+    def generate_report(
+        self, game_type: GameType, total_draws: int, tickets: int = 1, drawn: int | None = None
+    ) -> BacktestReport:
+        return BacktestReport(
+            basic_accuracy=self.calculate_basic_metrics(total_draws, tickets, drawn),
+            monetary_metrics=self.calculate_monetary_metrics(game_type, total_draws, tickets, drawn),
+            statistical_quality=None,
+        )
+
+    def calculate_basic_metrics(self, total_draws: int, tickets: int = 1, drawn: int | None = None) -> BasicMetrics:
+        drawn = total_draws if drawn is None else drawn
+        probabilities = self._mixed_probabilities(total_draws, drawn)
+        # tickets of a portfolio are independent, a draw is a hit when any of them matches
+        draw_hit_rate = float(1 - self._probabilities[0] ** tickets)
+
+        return BasicMetrics(
+            total_draws=total_draws,
+            hit_rate=float(1 - probabilities[0]),
+            max_streak=round(expected_longest_run(draw_hit_rate, drawn)),
+            average_hits_per_bet=float(probabilities @ np.arange(self._take + 1)),
+            match_distribution={k: float(p * total_draws * tickets) for k, p in enumerate(probabilities)},
+            match_distribution_pct={k: float(p) for k, p in enumerate(probabilities)},
+        )
+
+    def calculate_monetary_metrics(
+        self, game_type: GameType, total_draws: int, tickets: int = 1, drawn: int | None = None
+    ) -> MonetaryMetrics:
+        drawn = total_draws if drawn is None else drawn
+        probabilities = self._mixed_probabilities(total_draws, drawn)
+        total_bets = total_draws * tickets
+        prizes = np.zeros(self._take + 1)
+
+        for matches, prize in MetricsCalculator.PRIZE_TABLES[game_type].items():
+            prizes[matches] = prize
+
+        expected_value = float(probabilities @ prizes)
+        variance = float(probabilities @ (prizes - expected_value) ** 2)
+        total_cost = total_bets * MetricsCalculator.TICKET_COSTS[game_type]
+        total_winnings = total_bets * expected_value
+        net_profit = total_winnings - total_cost
+
+        winning_distribution: dict[int, float] = {}
+        for prize, probability in zip(prizes.astype(int).tolist(), probabilities.tolist(), strict=True):
+            winning_distribution[prize] = winning_distribution.get(prize, 0) + probability * total_bets
+
+        return MonetaryMetrics(
+            total_winnings=total_winnings,
+            total_cost=total_cost,
+            net_profit=net_profit,
+            roi_pct=(net_profit / total_cost) * 100 if total_cost > 0 else 0,
+            expected_value=expected_value,
+            variance_of_returns=variance,
+            # the drawdown depends on the order of the draws, so it has no closed form here
+            max_drawdown=None,
+            winning_distribution=winning_distribution,
+        )
+
+    def _mixed_probabilities(self, total_draws: int, drawn: int) -> np.ndarray:
+        share = drawn / total_draws if total_draws else 1.0
+        probabilities = self._probabilities * share
+        probabilities[0] += 1 - share
+
+        return probabilities
+
+    @staticmethod
+    def score_tickets(data: DrawStore, tickets: np.ndarray, game_type: GameType) -> GameBatch:
+        tickets = np.broadcast_to(np.asarray(tickets, dtype=np.uint8), (len(data), AbstractStrategy.TAKE))
+        matches = count_matches(data.masks(game_type), encode_masks(tickets))
+
+        return GameBatch(
+            game_type=game_type,
+            draw_dates=data.draw_dates,
+            draw_results=data.numbers(game_type),
+            generated_numbers=tickets,
+            matches=matches,
+        )
+
+
+def expected_longest_run(p: float, trials: int) -> float:
+    if trials == 0 or p == 0:
+        return 0.0
+    if p == 1:
+        return float(trials)
+
+    # no_run[k, m - 1] = P(no run of m successes in k trials), via
+    # A(k) = A(k - 1) - q * p^m * A(k - m - 1) with A(-1) = 1 / q and A(k) = 1 for 0 <= k < m
+    q = 1 - p
+    run_lengths = np.arange(1, min(trials, _MAX_RUN) + 1)
+    decay = q * p**run_lengths
+    # the recurrence looks back at most len(run_lengths) + 1 rows, so only those are kept in a ring
+    rows = len(run_lengths) + 2
+    no_run = np.ones((rows, len(run_lengths)))
+
+    for k in range(1, trials + 1):
+        back = k - run_lengths - 1
+        previous = np.where(back >= 0, no_run[np.maximum(back, 0) % rows, run_lengths - 1], 1 / q)
+        no_run[k % rows] = np.where(back >= -1, no_run[(k - 1) % rows] - decay * previous, 1.0)
+
+    at_least = 1 - no_run[trials % rows]
+
+    if at_least[-1] <= _NEGLIGIBLE:
+        return float(at_least[at_least > _NEGLIGIBLE].sum())
+
+    # longer runs are still likely, carry on one run length at a time past the table
+    expected = float(at_least.sum())
+
+    for run_length in range(len(run_lengths) + 1, trials + 1):
+        probability = 1 - _no_run_probability(p, run_length, trials)
+
+        if probability <= _NEGLIGIBLE:
+            break
+
+        expected += probability
+
+    return expected
+
+
+def _no_run_probability(p: float, run_length: int, trials: int) -> float:
+    if trials < run_length:
+        return 1.0
+
+    # the same recurrence, a block of run_length + 1 trials at a time: A(k - run_length - 1) for a whole block
+    # is the previous block, so each block is a cumulative sum of the one before - O(trials) without the table
+    q = 1 - p
+    decay = q * p**run_length
+    block = np.ones(run_length + 1)
+    block[0] = 1 / q
+    last = 1.0
+    start = run_length
+
+    while True:
+        block = last - decay * np.cumsum(block)
+
+        if trials <= start + run_length:
+            return float(block[trials - start])
+
+        last = block[-1]
+        start += run_length + 1
@@ -0,0 +1,70 @@
+import argparse
+import re
+import subprocess
+import sys
+
+HEAVY_MODULES = ('numpy', 'pandas', 'plotly', 'requests', 'rich', 'scipy', 'yaml')
+
+_IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def measure(command: list[str]) -> tuple[int, set[str]]:
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-m', 'lotto', *command],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    total_us = 0
+    modules = set()
+
+    for line in process.stderr.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+
+        if not match:
+            continue
+
+        _, cumulative, indent, module = match.groups()
+        modules.add(module)
+
+        if not indent.removeprefix(' '):
+            total_us += int(cumulative)
+
+    return total_us, modules
+
+
+def run(command: list[str], repeat: int) -> dict[str, object]:
+    # the first start after a checkout or a strategy edit rebuilds the strategy manifest, importing every strategy
+    # module - a one-off cost, so warm it up untimed and only sample steady-state starts
+    measure(command)
+    samples = [measure(command) for _ in range(repeat)]
+    total_us = min(total for total, _ in samples)
+    heavy_modules = sorted(m for m in samples[0][1] if m.split('.')[0] in HEAVY_MODULES and '.' not in m)
+
+    return {'command': command, 'import_ms': total_us / 1000, 'heavy_modules': heavy_modules}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Check cold-start import time of a lotto command.')
+    parser.add_argument('command', nargs='*', default=['strategies'])
+    parser.add_argument('--budget-ms', type=float, default=150.0)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--allow-heavy', action='store_true', help='do not fail when heavy modules are imported')
+    args = parser.parse_args()
+
+    result = run(args.command, args.repeat)
+
+    print(f'command:       lotto {" ".join(result["command"])}')
+    print(f'import time:   {result["import_ms"]:.1f} ms (budget {args.budget_ms:.0f} ms, best of {args.repeat})')
+    print(f'heavy modules: {", ".join(result["heavy_modules"]) or "-"}')
+
+    failed = result['import_ms'] > args.budget_ms or (result['heavy_modules'] and not args.allow_heavy)
+
+    if failed:
+        print('FAILED: cold start regressed')
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
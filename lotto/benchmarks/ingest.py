@@ -0,0 +1,95 @@
+import argparse
+import json
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from datetime import datetime
+
+import numpy as np
+
+from ..core import DrawStore, LottoDrawRecord
+from ..lotto_client import CHUNK_SIZE, ISO_DATE_FORMAT, build_draw_store, iter_json_array
+from .synthetic import generate_payload
+
+
+def legacy_ingest(payload: bytes) -> DrawStore:
+    body = json.loads(payload)
+
+    return DrawStore.from_records(
+        [
+            LottoDrawRecord(
+                draw_date=datetime.strptime(record['draw_date'], '%Y-%m-%d').date(),
+                lotto_numbers=record['lotto_numbers'],
+                plus_numbers=record['plus_numbers'],
+            )
+            for record in body
+        ]
+    )
+
+
+def streaming_ingest(payload: bytes) -> DrawStore:
+    # synthetic payloads use ISO dates, so the benchmark runs without a config file
+    return build_draw_store(iter_json_array(_chunks(payload)), ISO_DATE_FORMAT)
+
+
+def _chunks(payload: bytes) -> Iterator[bytes]:
+    for start in range(0, len(payload), CHUNK_SIZE):
+        yield payload[start : start + CHUNK_SIZE]
+
+
+def _measure(ingest: Callable[[bytes], DrawStore], payload: bytes) -> tuple[DrawStore, float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    data = ingest(payload)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return data, elapsed, peak
+
+
+def run(draws: int, seed: int) -> dict[str, float]:
+    payload = generate_payload(draws, seed)
+
+    # timed without tracemalloc, which slows allocation-heavy code unevenly
+    start = time.perf_counter()
+    expected = legacy_ingest(payload)
+    legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = streaming_ingest(payload)
+    streaming = time.perf_counter() - start
+
+    _, _, legacy_peak = _measure(legacy_ingest, payload)
+    _, _, streaming_peak = _measure(streaming_ingest, payload)
+
+    for name in ('draw_dates', 'lotto_numbers', 'plus_numbers'):
+        if not np.array_equal(getattr(expected, name), getattr(actual, name)):
+            raise AssertionError(f'{name} differs between legacy and streaming ingest')
+
+    return {
+        'draws': draws,
+        'payload_bytes': len(payload),
+        'legacy_s': legacy,
+        'streaming_s': streaming,
+        'legacy_peak_bytes': legacy_peak,
+        'streaming_peak_bytes': streaming_peak,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare full-body and streaming ingest of draw results JSON.')
+    parser.add_argument('--draws', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    result = run(args.draws, args.seed)
+
+    print(f'draws:     {result["draws"]:,} ({result["payload_bytes"] / 2**20:.1f} MiB of JSON)')
+    print(f'legacy:    {result["legacy_s"]:.3f} s, peak {result["legacy_peak_bytes"] / 2**20:.1f} MiB')
+    print(f'streaming: {result["streaming_s"]:.3f} s, peak {result["streaming_peak_bytes"] / 2**20:.1f} MiB')
+    print(f'speed-up:  {result["legacy_s"] / result["streaming_s"]:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+import argparse
+import math
+import statistics
+import time
+from collections import Counter
+from dataclasses import asdict
+
+import numpy as np
+
+from ..core import GameRecord, GameType
+from ..metrics import BacktestReport, BasicMetrics, MetricsCalculator, MonetaryMetrics, StatisticalMetrics
+from ..stats import chi_square
+
+
+def generate_games(size: int, seed: int) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    matches = rng.hypergeometric(6, 43, 6, size=size).astype(np.uint8)
+    generated_numbers = np.argpartition(rng.random((size, 49)), 6, axis=1)[:, :6] + 1
+    generated_numbers.sort(axis=1)
+    return matches, generated_numbers.astype(np.uint8)
+
+
+def legacy_report(records: list[GameRecord], game_type: GameType) -> BacktestReport:
+    prize_table = MetricsCalculator.PRIZE_TABLES[game_type]
+    matches = [r.matches for r in records]
+    winnings = [prize_table.get(m, 0) for m in matches]
+    total_draws = len(records)
+    total_cost = total_draws * MetricsCalculator.TICKET_COSTS[game_type]
+    total_winnings = sum(winnings)
+    match_distribution = Counter(matches)
+
+    all_generated = [n for r in records for n in r.generated_numbers]
+    sums = [sum(r.generated_numbers) for r in records]
+    parity = Counter(sum(1 for n in r.generated_numbers if n % 2 == 0) for r in records)
+    frequency = Counter(all_generated)
+    observed = [frequency.get(i, 0) for i in range(1, 50)]
+    _, p_value = chi_square(observed, [sum(observed) / 49] * 49)
+    probabilities = [count / len(all_generated) for count in frequency.values()]
+
+    return BacktestReport(
+        basic_accuracy=BasicMetrics(
+            total_draws=total_draws,
+            hit_rate=sum(1 for m in matches if m >= 1) / total_draws,
+            max_streak=_legacy_max_streak(matches, 1),
+            average_hits_per_bet=statistics.mean(matches),
+            match_distribution=dict(match_distribution),
+            match_distribution_pct={k: v / total_draws for k, v in match_distribution.items()},
+        ),
+        monetary_metrics=MonetaryMetrics(
+            total_winnings=total_winnings,
+            total_cost=total_cost,
+            net_profit=total_winnings - total_cost,
+            roi_pct=(total_winnings - total_cost) / total_cost * 100,
+            expected_value=statistics.mean(winnings),
+            variance_of_returns=statistics.variance(winnings),
+            max_drawdown=_legacy_max_drawdown(winnings, MetricsCalculator.TICKET_COSTS[game_type]),
+            winning_distribution=dict(Counter(winnings)),
+        ),
+        statistical_quality=StatisticalMetrics(
+            coverage=len(frequency),
+            coverage_pct=len(frequency) / 49 * 100,
+            number_frequency=dict(frequency),
+            chi_square_pvalue=float(p_value),
+            entropy=-sum(p * math.log2(p) for p in probabilities),
+            average_sum=statistics.mean(sums),
+            sum_std_dev=statistics.stdev(sums),
+            parity_distribution={f'{even}/{6 - even}': count for even, count in parity.items()},
+        ),
+    )
+
+
+def _legacy_max_streak(values: list[int], min_hits: int) -> int:
+    current_streak = 0
+    max_streak = 0
+
+    for value in values:
+        current_streak = current_streak + 1 if value >= min_hits else 0
+        max_streak = max(max_streak, current_streak)
+
+    return max_streak
+
+
+def _legacy_max_drawdown(winnings: list[int], cost: float) -> float:
+    balance = 0.0
+    peak = 0.0
+    max_drawdown = 0.0
+
+    for value in winnings:
+        balance += value - cost
+        peak = max(peak, balance)
+        max_drawdown = max(max_drawdown, peak - balance)
+
+    return max_drawdown
+
+
+def _assert_reports_equal(expected: BacktestReport, actual: BacktestReport) -> None:
+    for section, values in asdict(expected).items():
+        for name, value in values.items():
+            other = asdict(actual)[section][name]
+            equal = math.isclose(value, other, rel_tol=1e-9) if isinstance(value, float) else value == other
+            if not equal:
+                raise AssertionError(f'{section}.{name}: {value!r} != {other!r}')
+
+
+def run(games: int, seed: int) -> dict[str, float]:
+    matches, generated_numbers = generate_games(games, seed)
+
+    start = time.perf_counter()
+    calculator = MetricsCalculator.from_arrays({GameType.LOTTO: matches}, {GameType.LOTTO: generated_numbers})
+    report = calculator.generate_report(GameType.LOTTO)
+    vectorised = time.perf_counter() - start
+
+    records = [
+        GameRecord(GameType.LOTTO, None, [], numbers, m)
+        for numbers, m in zip(generated_numbers.tolist(), matches.tolist(), strict=True)
+    ]
+
+    start = time.perf_counter()
+    expected = legacy_report(records, GameType.LOTTO)
+    legacy = time.perf_counter() - start
+
+    _assert_reports_equal(expected, report)
+    return {'games': games, 'legacy_s': legacy, 'vectorised_s': vectorised, 'speedup': legacy / vectorised}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Compare pure-Python and vectorised metrics on simulated games.')
+    parser.add_argument('--games', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    result = run(args.games, args.seed)
+
+    print(f'games:      {result["games"]:,}')
+    print(f'legacy:     {result["legacy_s"]:.3f} s')
+    print(f'vectorised: {result["vectorised_s"]:.3f} s')
+    print(f'speed-up:   {result["speedup"]:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import time
+
+import numpy as np
+
+from ..stats import chi2_sf, chi_square
+
+TOLERANCE = 1e-9
+
+
+def run(samples: int, seed: int) -> dict[str, float]:
+    from scipy.stats import chi2, chisquare
+
+    rng = np.random.default_rng(seed)
+    max_error = 0.0
+
+    for df in (1, 2, 5, 10, 48, 100, 1000):
+        for x in np.linspace(0, 3 * df + 50, 200):
+            max_error = max(max_error, abs(chi2_sf(float(x), df) - float(chi2.sf(x, df))))
+
+    frequencies = rng.multinomial(rng.integers(49, 600_000, size=samples), np.full(49, 1 / 49))
+
+    start = time.perf_counter()
+    builtin = [chi_square(f) for f in frequencies]
+    builtin_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reference = [chisquare(f) for f in frequencies]
+    scipy_s = time.perf_counter() - start
+
+    for (statistic, p_value), expected in zip(builtin, reference, strict=True):
+        max_error = max(
+            max_error, abs(p_value - expected.pvalue), abs(statistic - expected.statistic) / expected.statistic
+        )
+
+    if max_error > TOLERANCE:
+        raise AssertionError(f'Built-in chi-square deviates from SciPy by {max_error:.3e}')
+
+    return {'samples': samples, 'max_error': max_error, 'builtin_s': builtin_s, 'scipy_s': scipy_s}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Cross-check built-in chi-square statistics against SciPy.')
+    parser.add_argument('--samples', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    try:
+        result = run(args.samples, args.seed)
+    except ImportError:
+        print('SciPy is not installed, skipping the cross-check')
+        return
+
+    print(f'samples:   {result["samples"]:,}')
+    print(f'max error: {result["max_error"]:.3e} (tolerance {TOLERANCE:.0e})')
+    print(f'built-in:  {result["builtin_s"]:.3f} s')
+    print(f'scipy:     {result["scipy_s"]:.3f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+import json
+import platform
+import time
+import tracemalloc
+from collections import deque
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from ..core import DrawStore, GameType
+from ..metrics import MetricsCalculator
+from ..registry import StrategyRegistry
+from ..simulation import BacktestEngine
+from ..visualisation import build_figure
+from .ingest import streaming_ingest
+from .synthetic import generate_payload, generate_store
+
+SIZES = (1_000, 10_000, 100_000)
+
+
+@dataclass
+class PhaseResult:
+    size: int
+    phase: str
+    seconds: float
+    peak_bytes: int
+
+
+@dataclass
+class Comparison:
+    size: int
+    phase: str
+    baseline_seconds: float
+    seconds: float
+
+    @property
+    def change(self) -> float:
+        return self.seconds / self.baseline_seconds - 1 if self.baseline_seconds else 0
+
+
+def count_phases(sizes: Sequence[int], strategies: Sequence[str]) -> int:
+    return len(sizes) * (3 + 2 * len(strategies))
+
+
+def run_suite(sizes: Sequence[int], strategies: Sequence[str], seed: int = 0, repeat: int = 3) -> Iterator[PhaseResult]:
+    for size in sizes:
+        for phase, benchmark in _phases(size, strategies, seed):
+            seconds, peak_bytes = _measure(benchmark, repeat)
+            yield PhaseResult(size=size, phase=phase, seconds=seconds, peak_bytes=peak_bytes)
+
+
+def save(results: Sequence[PhaseResult], path: Path, seed: int) -> None:
+    baseline = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'seed': seed,
+        'results': [asdict(result) for result in results],
+    }
+
+    path.write_text(json.dumps(baseline, indent=2), encoding='utf-8')
+
+
+def load(path: Path) -> list[PhaseResult]:
+    baseline = json.loads(path.read_text(encoding='utf-8'))
+    return [PhaseResult(**result) for result in baseline['results']]
+
+
+def compare(baseline: Sequence[PhaseResult], results: Sequence[PhaseResult]) -> list[Comparison]:
+    baseline_seconds = {(result.size, result.phase): result.seconds for result in baseline}
+
+    return [
+        Comparison(
+            size=result.size,
+            phase=result.phase,
+            baseline_seconds=baseline_seconds[result.size, result.phase],
+            seconds=result.seconds,
+        )
+        for result in results
+        if (result.size, result.phase) in baseline_seconds
+    ]
+
+
+def _phases(size: int, strategies: Sequence[str], seed: int) -> Iterator[tuple[str, Callable[[], object]]]:
+    payload = generate_payload(size, seed)
+    yield 'ingest', lambda: streaming_ingest(payload)
+
+    data = generate_store(size, seed)
+
+    for name in strategies:
+        yield f'backtest:{name}', lambda name=name: _backtest(name, data, seed, batch=True)
+        yield f'walk:{name}', lambda name=name: _backtest(name, data, seed, batch=False)
+
+    reference = StrategyRegistry.resolve('random', {})
+    reference.seed(seed)
+    records = BacktestEngine(reference).run(data)
+    yield 'metrics', lambda: [MetricsCalculator(records).generate_report(game_type) for game_type in GameType]
+
+    matches = {batch.game_type: batch.matches for batch in BacktestEngine(reference).score_batch(data)}
+    yield 'figure', lambda: build_figure(data.draw_dates, matches, 'benchmark')
+
+
+def _backtest(name: str, data: DrawStore, seed: int, batch: bool) -> None:
+    strategy = StrategyRegistry.resolve(name, {})
+    strategy.seed(seed)
+    engine = BacktestEngine(strategy, batch=batch, keep_history=False)
+    # a fresh store per repetition, so the per-draw tables cached by the previous one are rebuilt and timed
+    deque(engine.results_gen(replace(data)), maxlen=0)
+
+
+def _measure(benchmark: Callable[[], object], repeat: int) -> tuple[float, int]:
+    # best of several untraced runs, then one traced run for the peak - tracemalloc skews the timings
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        benchmark()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    benchmark()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return min(timings), peak_bytes
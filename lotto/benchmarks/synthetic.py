@@ -0,0 +1,56 @@
+import json
+from datetime import date, timedelta
+
+import numpy as np
+
+from ..core import AbstractStrategy, DrawStore, LottoDrawRecord
+
+FIRST_DRAW_DATE = date(1957, 1, 27)
+# draws on Tuesday, Thursday and Saturday
+DRAW_GAPS = (2, 2, 3)
+# the last third of the history carries Lotto Plus results, as the real one does since 2011
+PLUS_SHARE = 1 / 3
+
+
+def generate_numbers(size: int, seed: int) -> tuple[list[date], np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    gaps = np.resize(DRAW_GAPS, size)
+    offsets = np.concatenate(([0], np.cumsum(gaps[:-1])))
+    draw_dates = [FIRST_DRAW_DATE + timedelta(days=int(offset)) for offset in offsets]
+
+    keys = rng.random((size, 2, AbstractStrategy.POOL_MAX))
+    numbers = np.argpartition(keys, AbstractStrategy.TAKE, axis=2)[:, :, : AbstractStrategy.TAKE] + 1
+    numbers.sort(axis=2)
+    numbers = numbers.astype(np.uint8)
+
+    plus_numbers = numbers[:, 1]
+    plus_numbers[: size - round(size * PLUS_SHARE)] = 0
+
+    return draw_dates, numbers[:, 0], plus_numbers
+
+
+def generate_records(size: int, seed: int = 0) -> list[LottoDrawRecord]:
+    draw_dates, lotto_numbers, plus_numbers = generate_numbers(size, seed)
+
+    return [
+        LottoDrawRecord(draw_date=draw_date, lotto_numbers=lotto, plus_numbers=plus if plus[0] else [])
+        for draw_date, lotto, plus in zip(draw_dates, lotto_numbers.tolist(), plus_numbers.tolist(), strict=True)
+    ]
+
+
+def generate_store(size: int, seed: int = 0) -> DrawStore:
+    draw_dates, lotto_numbers, plus_numbers = generate_numbers(size, seed)
+    return DrawStore.from_arrays(np.array(draw_dates, dtype='datetime64[D]'), lotto_numbers, plus_numbers)
+
+
+def generate_payload(size: int, seed: int = 0) -> bytes:
+    records = [
+        {
+            'draw_date': record.draw_date.isoformat(),
+            'lotto_numbers': record.lotto_numbers,
+            'plus_numbers': record.plus_numbers,
+        }
+        for record in generate_records(size, seed)
+    ]
+
+    return json.dumps(records).encode()
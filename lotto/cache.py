@@ -0,0 +1,277 @@
+import contextlib
+import functools
+import hashlib
+import os
+import pickle
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+from .core import AbstractStrategy, DrawStore
+from .registry import StrategyRegistry
+from .settings import get_config
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS draws (
+    draw_date TEXT PRIMARY KEY,
+    lotto_numbers BLOB NOT NULL,
+    plus_numbers BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+@dataclass
+class CacheInfo:
+    path: Path
+    draws: int
+    first_draw_date: date | None
+    last_draw_date: date | None
+    synced_at: float | None
+    size_bytes: int
+
+
+class DrawCache:
+    FILENAME = 'draws.sqlite3'
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._path = path
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(_SCHEMA)
+
+    @classmethod
+    def open_default(cls) -> 'DrawCache':
+        return cls(Path(get_config().cache.dir).expanduser() / cls.FILENAME)
+
+    def __enter__(self) -> 'DrawCache':
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def last_draw_date(self) -> date | None:
+        (value,) = self._connection.execute('SELECT MAX(draw_date) FROM draws').fetchone()
+        return date.fromisoformat(value) if value else None
+
+    def synced_at(self) -> float | None:
+        row = self._connection.execute("SELECT value FROM meta WHERE key = 'synced_at'").fetchone()
+        return float(row[0]) if row else None
+
+    def is_fresh(self) -> bool:
+        synced_at = self.synced_at()
+        return synced_at is not None and time.time() - synced_at < get_config().cache.ttl
+
+    def store(self, data: DrawStore) -> None:
+        rows = zip(
+            np.datetime_as_string(data.draw_dates, unit='D').tolist(),
+            map(bytes, data.lotto_numbers),
+            map(bytes, data.plus_numbers),
+            strict=True,
+        )
+
+        with self._connection:
+            self._connection.executemany('INSERT OR REPLACE INTO draws VALUES (?, ?, ?)', rows)
+            self._connection.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('synced_at', ?)",
+                (str(time.time()),),
+            )
+
+    def query(self, date_from: date | None, date_to: date | None, top: int | None) -> DrawStore:
+        clauses = []
+        args: list[str | int] = []
+
+        if date_from:
+            clauses.append('draw_date >= ?')
+            args.append(date_from.isoformat())
+        if date_to:
+            clauses.append('draw_date <= ?')
+            args.append(date_to.isoformat())
+
+        sql = 'SELECT draw_date, lotto_numbers, plus_numbers FROM draws'
+        sql += f' WHERE {" AND ".join(clauses)}' if clauses else ''
+
+        if top is not None:
+            sql += ' ORDER BY draw_date DESC LIMIT ?'
+            args.append(top)
+        else:
+            sql += ' ORDER BY draw_date'
+
+        rows = self._connection.execute(sql, args).fetchall()
+
+        if top is not None:
+            rows.reverse()
+
+        return self._to_store(rows)
+
+    def info(self) -> CacheInfo:
+        count, first, last = self._connection.execute(
+            'SELECT COUNT(*), MIN(draw_date), MAX(draw_date) FROM draws'
+        ).fetchone()
+
+        return CacheInfo(
+            path=self._path,
+            draws=count,
+            first_draw_date=date.fromisoformat(first) if first else None,
+            last_draw_date=date.fromisoformat(last) if last else None,
+            synced_at=self.synced_at(),
+            size_bytes=self._path.stat().st_size,
+        )
+
+    def clear(self) -> None:
+        with self._connection:
+            self._connection.execute('DELETE FROM draws')
+            self._connection.execute('DELETE FROM meta')
+
+        self._connection.execute('VACUUM')
+
+    @staticmethod
+    def _to_store(rows: list[tuple[str, bytes, bytes]]) -> DrawStore:
+        if not rows:
+            return DrawStore.empty()
+
+        take = AbstractStrategy.TAKE
+        draw_dates, lotto_numbers, plus_numbers = zip(*rows, strict=True)
+
+        return DrawStore.from_arrays(
+            np.array(draw_dates, dtype='datetime64[D]'),
+            np.frombuffer(b''.join(lotto_numbers), dtype=np.uint8).reshape(-1, take),
+            np.frombuffer(b''.join(plus_numbers), dtype=np.uint8).reshape(-1, take),
+        )
+
+
+class StateCache:
+    DIRNAME = 'strategies'
+    SUFFIX = '.pickle'
+
+    def __init__(self, path: Path, max_bytes: int) -> None:
+        self._path = path
+        self._max_bytes = max_bytes
+
+        # a read-only cache dir only costs preparing every strategy from scratch
+        try:
+            path.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            self._max_bytes = 0
+
+    @classmethod
+    def open_default(cls) -> 'StateCache':
+        config = get_config().cache
+        return cls(Path(config.dir).expanduser() / cls.DIRNAME, config.state_max_mb * 2**20)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def prepare(self, strategy: AbstractStrategy, strategy_name: str, params: dict[str, str], data: DrawStore) -> None:
+        names = StrategyRegistry.state(strategy_name)
+
+        if not names or not self._max_bytes:
+            strategy.prepare_data(data)
+            return
+
+        key = self._key(strategy, params, data)
+
+        if not self._load(key, strategy, names):
+            strategy.prepare_data(data)
+            self._store(key, {name: getattr(strategy, name) for name in names})
+
+    def entries(self) -> list[Path]:
+        return list(self._path.glob(f'*{self.SUFFIX}'))
+
+    def size_bytes(self) -> int:
+        return sum(entry.stat().st_size for entry in self.entries())
+
+    def clear(self) -> None:
+        for entry in self.entries():
+            entry.unlink(missing_ok=True)
+
+    def _key(self, strategy: AbstractStrategy, params: dict[str, str], data: DrawStore) -> str:
+        strategy_type = type(strategy)
+        parts = [
+            f'{strategy_type.__module__}.{strategy_type.__qualname__}',
+            # state pickled by older code is never reused, whether the strategy or the core types it keeps changed
+            _code_version(strategy_type.__module__),
+            _code_version(AbstractStrategy.__module__),
+            *sorted(params.items()),
+        ]
+        params_hash = hashlib.blake2b(repr(parts).encode(), digest_size=8).hexdigest()
+
+        return f'{params_hash}-{data.fingerprint()}'
+
+    def _load(self, key: str, strategy: AbstractStrategy, names: tuple[str, ...]) -> bool:
+        entry = self._path / f'{key}{self.SUFFIX}'
+
+        try:
+            with entry.open('rb') as f:
+                state = pickle.load(f)  # noqa: S301
+        except FileNotFoundError:
+            return False
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # written by an older version of the strategy or cut short, prepare again and overwrite it
+            entry.unlink(missing_ok=True)
+            return False
+
+        if set(state) != set(names):
+            return False
+
+        for name, value in state.items():
+            setattr(strategy, name, value)
+
+        # touch the entry so eviction drops the least recently used state first
+        with contextlib.suppress(OSError):
+            os.utime(entry)
+        return True
+
+    def _store(self, key: str, state: dict[str, object]) -> None:
+        entry = self._path / f'{key}{self.SUFFIX}'
+        partial = entry.with_suffix(f'.{os.getpid()}.partial')
+
+        # the state is already prepared in memory, failing to keep it only costs a prepare next time
+        try:
+            with partial.open('wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            os.replace(partial, entry)
+        except OSError:
+            partial.unlink(missing_ok=True)
+            return
+
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = sorted((entry.stat().st_mtime, entry.stat().st_size, entry) for entry in self.entries())
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, entry in entries:
+            if total <= self._max_bytes:
+                break
+
+            entry.unlink(missing_ok=True)
+            total -= size
+
+
+@functools.cache
+def _code_version(module_name: str) -> str:
+    try:
+        source = Path(sys.modules[module_name].__file__).read_bytes()
+    except (TypeError, OSError):
+        # frozen builds ship without sources, but every rebuild is a new executable
+        source = str(Path(sys.executable).stat().st_mtime_ns).encode()
+
+    return hashlib.blake2b(source, digest_size=8).hexdigest()
@@ -1,40 +1,69 @@
+import importlib.util
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime
-from functools import reduce
+from enum import StrEnum
+from pathlib import Path
 from typing import Annotated
 
 import typer
-from rich.columns import Columns
-from rich.console import Console
-from rich.progress import BarColumn, Progress, TaskProgressColumn, TextColumn
-from rich.style import Style
-from rich.table import Table
-from rich.text import Text
-
-from . import lotto_client
-from .core import GameType, StrategyRegistry
-from .metrics import BacktestReport, MetricsCalculator
-from .settings import config
-from .simulation import BacktestEngine
-from .visualisation import visualise_results
-
-_app = typer.Typer(name=config.app.name, add_completion=False, no_args_is_help=True)
-_console = Console()
-
-_spinner_type = 'arc'
-_color = 'bright_cyan'
-
-_progress = Progress(
-    TextColumn('{task.description}'),
-    BarColumn(style=Style(), complete_style=_color, finished_style=_color, pulse_style=_color),
-    TaskProgressColumn(text_format='{task.percentage:>3.0f}%'),
-    console=_console,
-    transient=True,
-)
+
+from .registry import StrategyRegistry
+from .settings import get_config
+
+# command bodies live in lotto.commands and are imported on demand,
+# so light commands don't pay for numpy, plotly, requests or rich
+_app = typer.Typer(add_completion=False, no_args_is_help=True)
+_cache_app = typer.Typer(name='cache', help='Manage the local draw results cache.', no_args_is_help=True)
+_app.add_typer(_cache_app)
+
+
+class _Resolution(StrEnum):
+    AUTO = 'auto'
+    DRAW = 'draw'
+    WEEK = 'week'
+    MONTH = 'month'
+    YEAR = 'year'
+
+
+class _ProfileMode(StrEnum):
+    CPROFILE = 'cprofile'
+    TRACEMALLOC = 'tracemalloc'
+
+
+_SeedOption = Annotated[int | None, typer.Option('--seed', help='Seed the strategy for reproducible tickets')]
+_ProfileOption = Annotated[bool, typer.Option('--profile', help='Time each phase and strategy call')]
+_ProfileWithOption = Annotated[
+    _ProfileMode | None, typer.Option('--profile-with', help='Also run under cProfile or tracemalloc')
+]
+_ProfileOutputOption = Annotated[
+    Path | None,
+    typer.Option('--profile-output', help='Save the profile as .json, a Chrome .trace.json or cProfile .prof'),
+]
+
+
+@contextmanager
+def _profiled(profile: bool, mode: _ProfileMode | None, output: Path | None) -> Iterator[None]:
+    if not (profile or mode or output):
+        yield
+        return
+
+    from .commands.common import print_profile
+    from .profiling import profiler
+
+    profiler.enable(mode.value if mode else None)
+
+    try:
+        yield
+    finally:
+        profiler.disable()
+
+    print_profile(output)
 
 
 def _is_date_str_valid(date_str: str) -> bool:
     try:
-        datetime.strptime(date_str, config.app.date_format)
+        datetime.strptime(date_str, get_config().app.date_format)
         return True
     except ValueError:
         return False
@@ -42,9 +71,17 @@ def _is_date_str_valid(date_str: str) -> bool:
 
 def _validate_date_options(date_from: str | None, date_to: str | None) -> None:
     if date_from and not _is_date_str_valid(date_from):
-        raise typer.BadParameter(f'Invalid date format for --date-from. Expected format: {config.app.date_format}')
+        date_format = get_config().app.date_format
+        raise typer.BadParameter(f'Invalid date format for --date-from. Expected format: {date_format}')
     if date_to and not _is_date_str_valid(date_to):
-        raise typer.BadParameter(f'Invalid date format for --date-to. Expected format: {config.app.date_format}')
+        date_format = get_config().app.date_format
+        raise typer.BadParameter(f'Invalid date format for --date-to. Expected format: {date_format}')
+
+
+def _require_module(module: str, option: str, path: Path) -> None:
+    # optional writers import their backend lazily, so check before any work is done rather than after it
+    if importlib.util.find_spec(module) is None:
+        raise typer.BadParameter(f'{option} {path} needs {module}, install it with "pip install {module}"')
 
 
 def _parse_params(params: str | None) -> dict[str, str]:
@@ -54,41 +91,52 @@ def _parse_params(params: str | None) -> dict[str, str]:
     return dict(param_item.split('=', 1) for param_item in params)
 
 
-def _get_metrics_table(title: str, report: BacktestReport) -> Table:
-    table = Table(title=Text(title, style='bold'))
+def _parse_scoped_params(params: list[str] | None, strategy_names: list[str]) -> dict[str, dict[str, str]]:
+    scoped: dict[str, dict[str, str]] = {name: {} for name in strategy_names}
+
+    for param_item in params or []:
+        name, _, assignment = param_item.partition('.')
+
+        if name not in scoped or '=' not in assignment:
+            raise typer.BadParameter(
+                f'Invalid param "{param_item}". Expected strategy.name=value for a compared strategy'
+            )
+
+        key, _, value = assignment.partition('=')
+        scoped[name][key] = value
+
+    return scoped
+
 
-    table.add_column(Text('Metric', justify='center'), no_wrap=True)
-    table.add_column('Value', justify='right', style=_color)
+def _parse_grid(grid: list[str]) -> dict[str, list[str]]:
+    parsed = {}
 
-    ba = report.basic_accuracy
+    for grid_item in grid:
+        name, _, spec = grid_item.partition('=')
 
-    table.add_row('total_draws', f'{ba.total_draws:.2f}')
-    table.add_row('hit_rate', f'{ba.hit_rate:.2f}')
-    table.add_row('max_streak', f'{ba.max_streak:.2f}')
-    table.add_row('average_hits_per_bet', f'{ba.average_hits_per_bet:.2f}')
-    table.add_section()
+        if not name or not spec:
+            raise typer.BadParameter(f'Invalid grid "{grid_item}". Expected name=a,b,c or name=start:stop[:step]')
 
-    mm = report.monetary_metrics
+        if ':' not in spec:
+            parsed[name] = spec.split(',')
+            continue
 
-    table.add_row('total_winnings', f'{mm.total_winnings:.2f}')
-    table.add_row('total_cost', f'{mm.total_cost:.2f}')
-    table.add_row('net_profit', f'{mm.net_profit:.2f}')
-    table.add_row('roi_pct', f'{mm.roi_pct:.2f}')
-    table.add_row('expected_value', f'{mm.expected_value:.2f}')
-    table.add_row('variance_of_returns', f'{mm.variance_of_returns:.2f}')
-    table.add_row('max_drawdown', f'{mm.max_drawdown:.2f}')
-    table.add_section()
+        try:
+            start, stop, step = (list(map(int, spec.split(':'))) + [1])[:3]
+        except ValueError:
+            raise typer.BadParameter(
+                f'Invalid range "{spec}" for {name}. Expected integers start:stop[:step]'
+            ) from None
 
-    sq = report.statistical_quality
+        if step < 1:
+            raise typer.BadParameter(f'Invalid range "{spec}" for {name}. The step must be a positive integer')
 
-    table.add_row('coverage', f'{sq.coverage:.2f}')
-    table.add_row('coverage_pct', f'{sq.coverage_pct:.2f}')
-    table.add_row('chi_square_pvalue', f'{sq.chi_square_pvalue:.2f}')
-    table.add_row('entropy', f'{sq.entropy:.2f}')
-    table.add_row('average_sum', f'{sq.average_sum:.2f}')
-    table.add_row('sum_std_dev', f'{sq.sum_std_dev:.2f}')
+        if start > stop:
+            raise typer.BadParameter(f'Invalid range "{spec}" for {name}. The start must not exceed the stop')
 
-    return table
+        parsed[name] = [str(value) for value in range(start, stop + 1, step)]
+
+    return parsed
 
 
 @_app.command(name='simulate')
@@ -98,49 +146,160 @@ def run_simulation(
     date_from: Annotated[str | None, typer.Option('--date-from')] = None,
     date_to: Annotated[str | None, typer.Option('--date-to')] = None,
     top: Annotated[int | None, typer.Option('--top', min=1)] = None,
+    offline: Annotated[bool, typer.Option('--offline')] = False,
+    runs: Annotated[int, typer.Option('--runs', min=1)] = 1,
+    workers: Annotated[int | None, typer.Option('--workers', min=1)] = None,
+    analytic: Annotated[
+        bool, typer.Option('--analytic', help='Exact expected metrics for strategies without draw-dependent tickets')
+    ] = False,
+    tickets: Annotated[int, typer.Option('--tickets', '-t', min=1, help='Tickets played per draw')] = 1,
+    spill: Annotated[
+        Path | None, typer.Option('--spill', help='Write every game record to a .parquet or compact binary file')
+    ] = None,
+    resolution: Annotated[
+        _Resolution, typer.Option('--resolution', help='Chart aggregation period')
+    ] = _Resolution.AUTO,
+    output: Annotated[
+        Path | None, typer.Option('--output', '-o', help='Save the chart to .html or an image instead of opening it')
+    ] = None,
+    seed: _SeedOption = None,
+    refit_every: Annotated[
+        int, typer.Option('--refit-every', min=0, help='Re-prepare every N draws, 0 prepares once (train/test split)')
+    ] = 1,
+    window: Annotated[int, typer.Option('--window', min=0, help='Train on the last N draws only, 0 expands')] = 0,
+    warmup: Annotated[int, typer.Option('--warmup', min=0, help='Leading draws used only for training')] = 0,
+    stop_confidence: Annotated[
+        float | None,
+        typer.Option('--stop-confidence', min=0.5, max=0.9999, help='Stop once the ROI sign is decided at this level'),
+    ] = None,
+    min_draws: Annotated[
+        int, typer.Option('--min-draws', min=2, help='Draws scored before --stop-confidence may stop the backtest')
+    ] = 500,
+    profile: _ProfileOption = False,
+    profile_with: _ProfileWithOption = None,
+    profile_output: _ProfileOutputOption = None,
 ) -> None:
     _validate_date_options(date_from, date_to)
 
-    with _console.status('Fetching data', spinner=_spinner_type, spinner_style=_color):
-        data = lotto_client.get_draw_results(date_from, date_to, top)
+    scheduled = refit_every != 1 or window or warmup or stop_confidence is not None
+
+    if scheduled and (runs > 1 or tickets > 1 or analytic):
+        raise typer.BadParameter(
+            '--refit-every, --window, --warmup and --stop-confidence apply to a single backtest only'
+        )
+
+    if tickets > 1 and runs > 1:
+        raise typer.BadParameter('--tickets cannot be combined with --runs')
+
+    if spill and (runs > 1 or analytic):
+        raise typer.BadParameter('--spill records a single backtest and cannot be combined with --runs or --analytic')
+
+    if spill and spill.suffix == '.parquet':
+        _require_module('pyarrow', '--spill', spill)
+
+    if output and output.suffix != '.html':
+        _require_module('kaleido', '--output', output)
+
+    if analytic and StrategyRegistry.requires_data(strategy_name):
+        raise typer.BadParameter(f'--analytic needs a strategy that ignores draw history, "{strategy_name}" does not')
+
+    from .commands import simulate
+    from .simulation import WalkSchedule
+
+    schedule = WalkSchedule(refit_every, window, warmup, stop_confidence, min_draws)
+
+    with _profiled(profile, profile_with, profile_output):
+        simulate.run(
+            strategy_name,
+            _parse_params(params),
+            date_from,
+            date_to,
+            top,
+            offline,
+            runs,
+            workers,
+            analytic,
+            tickets,
+            spill,
+            resolution.value,
+            output,
+            seed,
+            schedule,
+        )
+
+
+@_app.command(name='compare')
+def run_comparison(
+    strategy_names: Annotated[list[str], typer.Option('--strategy', '-s', help='Strategy to compare, repeatable')],
+    params: Annotated[list[str] | None, typer.Option('--param', '-p', help='strategy.name=value')] = None,
+    date_from: Annotated[str | None, typer.Option('--date-from')] = None,
+    date_to: Annotated[str | None, typer.Option('--date-to')] = None,
+    top: Annotated[int | None, typer.Option('--top', min=1)] = None,
+    offline: Annotated[bool, typer.Option('--offline')] = False,
+    seed: _SeedOption = None,
+    resolution: Annotated[
+        _Resolution, typer.Option('--resolution', help='Chart aggregation period')
+    ] = _Resolution.AUTO,
+    output: Annotated[
+        Path | None, typer.Option('--output', '-o', help='Save the chart to .html or an image instead of opening it')
+    ] = None,
+    profile: _ProfileOption = False,
+    profile_with: _ProfileWithOption = None,
+    profile_output: _ProfileOutputOption = None,
+) -> None:
+    _validate_date_options(date_from, date_to)
 
-    params_dict = _parse_params(params)
-    strategy = StrategyRegistry.resolve(strategy_name, params_dict)
-    backtest = BacktestEngine(strategy)
+    if len(set(strategy_names)) != len(strategy_names):
+        raise typer.BadParameter('Each strategy can be compared only once')
 
-    results_iterator = backtest.results_gen(data)
-    total_games = reduce(lambda x, y: x + (2 if y.plus_numbers else 1), data, 0)
-    results = []
+    if unknown := [name for name in strategy_names if name not in StrategyRegistry.list_strategies()]:
+        raise typer.BadParameter(f'Unknown strategies: {", ".join(unknown)}')
 
-    with _progress:
-        task = _progress.add_task('Backtest:', total=total_games)
+    if output and output.suffix != '.html':
+        _require_module('kaleido', '--output', output)
 
-        for result in results_iterator:
-            results.append(result)
-            _progress.advance(task)
+    scoped_params = _parse_scoped_params(params, strategy_names)
 
-    metrics_calculator = MetricsCalculator(backtest.history)
-    lotto_metrics = metrics_calculator.generate_report(GameType.LOTTO)
-    lotto_plus_metrics = metrics_calculator.generate_report(GameType.LOTTO_PLUS)
+    from .commands import compare
 
-    lotto_table = _get_metrics_table('Lotto - metrics', lotto_metrics)
-    lotto_plus_table = _get_metrics_table('Lotto Plus - metrics', lotto_plus_metrics)
+    with _profiled(profile, profile_with, profile_output):
+        compare.run(strategy_names, scoped_params, date_from, date_to, top, offline, seed, resolution.value, output)
 
-    _console.print()
-    _console.print(Columns([lotto_table, lotto_plus_table], padding=(0, 2)))
-    _console.print()
 
-    visualise_results(results, strategy_name)
+@_app.command(name='sweep')
+def run_sweep(
+    strategy_name: Annotated[str, typer.Option('--strategy', '-s')],
+    grid: Annotated[list[str], typer.Option('--grid', '-g', help='name=a,b,c or name=start:stop[:step] (inclusive)')],
+    params: Annotated[list[str] | None, typer.Option('--param', '-p')] = None,
+    date_from: Annotated[str | None, typer.Option('--date-from')] = None,
+    date_to: Annotated[str | None, typer.Option('--date-to')] = None,
+    top: Annotated[int | None, typer.Option('--top', min=1)] = None,
+    offline: Annotated[bool, typer.Option('--offline')] = False,
+    workers: Annotated[int | None, typer.Option('--workers', min=1)] = None,
+    limit: Annotated[int, typer.Option('--limit', min=1)] = 10,
+    output: Annotated[Path | None, typer.Option('--output', '-o', help='.csv or .parquet file')] = None,
+) -> None:
+    _validate_date_options(date_from, date_to)
+
+    if output and output.suffix == '.parquet':
+        _require_module('pyarrow', '--output', output)
+
+    grid_dict = _parse_grid(grid)
+    params_dict = _parse_params(params)
+
+    from .commands import sweep
+
+    sweep.run(strategy_name, grid_dict, params_dict, date_from, date_to, top, offline, workers, limit, output)
 
 
 @_app.command(name='strategies')
 def list_strategies() -> None:
     strategies = StrategyRegistry.list_strategies()
 
-    _console.print('Available Strategies:', style='bold')
+    typer.secho('Available Strategies:', bold=True)
 
     for strategy in strategies:
-        _console.print(f'- {strategy}')
+        typer.echo(f'- {strategy}')
 
 
 @_app.command(name='generate')
@@ -150,23 +309,71 @@ def generate_numbers(
     date_from: Annotated[str | None, typer.Option('--date-from')] = None,
     date_to: Annotated[str | None, typer.Option('--date-to')] = None,
     top: Annotated[int, typer.Option('--top', min=1)] = 100,
+    offline: Annotated[bool, typer.Option('--offline')] = False,
+    seed: _SeedOption = None,
+    profile: _ProfileOption = False,
+    profile_with: _ProfileWithOption = None,
+    profile_output: _ProfileOutputOption = None,
 ) -> None:
     _validate_date_options(date_from, date_to)
 
-    params_dict = _parse_params(params)
-    requires_data = StrategyRegistry.requires_data(strategy_name)
+    from .commands import generate
+
+    with _profiled(profile, profile_with, profile_output):
+        generate.run(strategy_name, _parse_params(params), date_from, date_to, top, offline, seed)
+
+
+@_app.command(name='serve')
+def run_server(
+    host: Annotated[str, typer.Option('--host')] = '127.0.0.1',
+    port: Annotated[int, typer.Option('--port', min=1, max=65535)] = 8000,
+    socket: Annotated[Path | None, typer.Option('--socket', help='Listen on a Unix socket instead of TCP')] = None,
+    refresh: Annotated[int, typer.Option('--refresh', min=1, help='Seconds between draw history refreshes')] = 300,
+    cache_size: Annotated[int, typer.Option('--cache-size', min=1, help='Prepared strategies kept warm')] = 32,
+    offline: Annotated[bool, typer.Option('--offline')] = False,
+) -> None:
+    from .commands import serve
+
+    serve.run(host, port, socket, refresh, cache_size, offline)
+
+
+@_app.command(name='bench')
+def run_benchmarks(
+    sizes: Annotated[list[int] | None, typer.Option('--size', min=1, help='Synthetic history sizes in draws')] = None,
+    strategies: Annotated[list[str] | None, typer.Option('--strategy', '-s')] = None,
+    repeat: Annotated[int, typer.Option('--repeat', min=1)] = 3,
+    seed: Annotated[int, typer.Option('--seed')] = 0,
+    save: Annotated[Path | None, typer.Option('--save', help='Write the results as a JSON baseline')] = None,
+    compare: Annotated[Path | None, typer.Option('--compare', help='JSON baseline to diff against')] = None,
+    tolerance: Annotated[float, typer.Option('--tolerance', min=0, help='Allowed slowdown before failing')] = 0.2,
+) -> None:
+    if compare and not compare.is_file():
+        raise typer.BadParameter(f'Baseline {compare} does not exist')
+
+    from .commands import bench
+
+    bench.run(sizes, strategies, repeat, seed, save, compare, tolerance)
+
+
+@_cache_app.command(name='sync')
+def sync_cache() -> None:
+    from .commands import cache
+
+    cache.sync()
+
+
+@_cache_app.command(name='info')
+def show_cache_info() -> None:
+    from .commands import cache
+
+    cache.info()
 
-    if requires_data:
-        with _console.status('Fetching data', spinner=_spinner_type, spinner_style=_color):
-            data = lotto_client.get_draw_results(date_from, date_to, top)
-    else:
-        data = []
 
-    strategy = StrategyRegistry.resolve(strategy_name, params_dict)
-    strategy.prepare_data(data)
-    numbers = strategy.generate_numbers()
+@_cache_app.command(name='clear')
+def clear_cache() -> None:
+    from .commands import cache
 
-    _console.print(f'Generated numbers: [bold green]{", ".join(map(str, numbers))}[/]')
+    cache.clear()
 
 
 def run_typer_app() -> None:
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import typer
+from rich.table import Table
+from rich.text import Text
+
+from ..benchmarks import suite
+from ..registry import StrategyRegistry
+from .common import COLOR, console, format_seconds, progress
+
+
+def run(
+    sizes: list[int] | None,
+    strategies: list[str] | None,
+    repeat: int,
+    seed: int,
+    save: Path | None,
+    compare: Path | None,
+    tolerance: float,
+) -> None:
+    sizes = sizes or list(suite.SIZES)
+    strategies = strategies or StrategyRegistry.list_strategies()
+    baseline = suite.load(compare) if compare else None
+    results = []
+
+    with progress:
+        task = progress.add_task('Benchmark:', total=suite.count_phases(sizes, strategies))
+
+        for result in suite.run_suite(sizes, strategies, seed, repeat):
+            results.append(result)
+            progress.advance(task)
+
+    comparisons = {(c.size, c.phase): c for c in suite.compare(baseline, results)} if baseline else {}
+
+    console.print()
+    console.print(_get_bench_table(results, comparisons, tolerance))
+    console.print()
+
+    if save:
+        suite.save(results, save, seed)
+        console.print(f'Baseline saved to [bold]{save}[/]')
+
+    regressions = [c for c in comparisons.values() if c.change > tolerance]
+
+    if regressions:
+        console.print(
+            f'{len(regressions)} phase(s) slower than the baseline by more than {tolerance:.0%}', style='bold red'
+        )
+        raise typer.Exit(1)
+
+
+def _get_bench_table(
+    results: list[suite.PhaseResult], comparisons: dict[tuple[int, str], suite.Comparison], tolerance: float
+) -> Table:
+    table = Table(title=Text('Benchmarks', style='bold'))
+
+    table.add_column('Draws', justify='right')
+    table.add_column(Text('Phase', justify='center'), no_wrap=True)
+    table.add_column('Time', justify='right', style=COLOR)
+    table.add_column('Peak memory', justify='right', style=COLOR)
+
+    if comparisons:
+        table.add_column('Baseline', justify='right')
+        table.add_column('Change', justify='right')
+
+    for result in results:
+        row = [f'{result.size:,}', result.phase, format_seconds(result.seconds), _format_bytes(result.peak_bytes)]
+        comparison = comparisons.get((result.size, result.phase))
+
+        if comparison:
+            style = 'red' if comparison.change > tolerance else 'green' if comparison.change < -tolerance else ''
+            row += [format_seconds(comparison.baseline_seconds), Text(f'{comparison.change:+.0%}', style=style)]
+        elif comparisons:
+            row += ['-', '-']
+
+        table.add_row(*row)
+
+    return table
+
+
+def _format_bytes(size: int) -> str:
+    return f'{size / 2**10:.1f} KiB' if size < 2**20 else f'{size / 2**20:.1f} MiB'
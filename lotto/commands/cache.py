@@ -0,0 +1,49 @@
+from datetime import datetime
+
+from rich.table import Table
+from rich.text import Text
+
+from .. import lotto_client
+from ..cache import DrawCache, StateCache
+from .common import COLOR, SPINNER_TYPE, console
+
+
+def sync() -> None:
+    with console.status('Syncing draw results', spinner=SPINNER_TYPE, spinner_style=COLOR):
+        new_draws = lotto_client.sync_draw_results()
+
+    console.print(f'Synced [bold green]{new_draws}[/] new draw results')
+
+
+def info() -> None:
+    with DrawCache.open_default() as cache:
+        cache_info = cache.info()
+
+    synced_at = cache_info.synced_at
+    synced_at = datetime.fromtimestamp(synced_at).isoformat(' ', 'seconds') if synced_at else 'never'
+
+    table = Table(title=Text('Draw results cache', style='bold'))
+    table.add_column(Text('Property', justify='center'), no_wrap=True)
+    table.add_column('Value', style=COLOR)
+
+    table.add_row('path', str(cache_info.path))
+    table.add_row('draws', str(cache_info.draws))
+    table.add_row('first_draw_date', str(cache_info.first_draw_date or '-'))
+    table.add_row('last_draw_date', str(cache_info.last_draw_date or '-'))
+    table.add_row('synced_at', synced_at)
+    table.add_row('size', f'{cache_info.size_bytes / 1024:.1f} KiB')
+
+    state_cache = StateCache.open_default()
+    table.add_row('strategy_states', str(len(state_cache.entries())))
+    table.add_row('strategy_states_size', f'{state_cache.size_bytes() / 1024:.1f} KiB')
+
+    console.print(table)
+
+
+def clear() -> None:
+    with DrawCache.open_default() as cache:
+        cache.clear()
+
+    StateCache.open_default().clear()
+
+    console.print('Cache cleared')
@@ -0,0 +1,125 @@
+from pathlib import Path
+
+import typer
+from rich.console import Console
+from rich.progress import BarColumn, Progress, TaskProgressColumn, TextColumn
+from rich.style import Style
+from rich.table import Table
+from rich.text import Text
+
+from ..core import DrawStore
+from ..metrics import BacktestReport
+from ..profiling import profiler
+
+SPINNER_TYPE = 'arc'
+COLOR = 'bright_cyan'
+
+console = Console()
+
+progress = Progress(
+    TextColumn('{task.description}'),
+    BarColumn(style=Style(), complete_style=COLOR, finished_style=COLOR, pulse_style=COLOR),
+    TaskProgressColumn(text_format='{task.percentage:>3.0f}%'),
+    console=console,
+    transient=True,
+)
+
+
+def get_draw_results(date_from: str | None, date_to: str | None, top: int | None, offline: bool) -> DrawStore:
+    from .. import lotto_client
+
+    with console.status('Fetching data', spinner=SPINNER_TYPE, spinner_style=COLOR), profiler.phase('fetch'):
+        data = lotto_client.get_draw_results(date_from, date_to, top, offline)
+
+    if not len(data):
+        console.print('No draw results found' + (' in the local cache' if offline else ''), style='bold red')
+        raise typer.Exit(1)
+
+    return data
+
+
+def metric_sections(report: BacktestReport) -> list[list[tuple[str, float]]]:
+    ba = report.basic_accuracy
+    mm = report.monetary_metrics
+    sq = report.statistical_quality
+
+    sections = [
+        [
+            ('total_draws', ba.total_draws),
+            ('hit_rate', ba.hit_rate),
+            ('max_streak', ba.max_streak),
+            ('average_hits_per_bet', ba.average_hits_per_bet),
+        ],
+        [
+            ('total_winnings', mm.total_winnings),
+            ('total_cost', mm.total_cost),
+            ('net_profit', mm.net_profit),
+            ('roi_pct', mm.roi_pct),
+            ('expected_value', mm.expected_value),
+            ('variance_of_returns', mm.variance_of_returns),
+        ],
+    ]
+
+    if mm.max_drawdown is not None:
+        sections[1].append(('max_drawdown', mm.max_drawdown))
+
+    if sq is not None:
+        sections.append(
+            [
+                ('coverage', sq.coverage),
+                ('coverage_pct', sq.coverage_pct),
+                ('chi_square_pvalue', sq.chi_square_pvalue),
+                ('entropy', sq.entropy),
+                ('average_sum', sq.average_sum),
+                ('sum_std_dev', sq.sum_std_dev),
+            ]
+        )
+
+    return sections
+
+
+def print_profile(output: Path | None) -> None:
+    console.print(_get_profile_table())
+    console.print()
+
+    if profiler.mode == 'cprofile':
+        console.out(profiler.top_functions(), highlight=False)
+
+    if output:
+        profiler.export(output)
+        console.print(f'Profile saved to [bold]{output}[/]')
+
+
+def _get_profile_table() -> Table:
+    table = Table(title=Text('Profile', style='bold'))
+
+    table.add_column(Text('Phase / call', justify='center'), no_wrap=True)
+    table.add_column('Count', justify='right', no_wrap=True)
+    table.add_column('Total', justify='right', no_wrap=True, style=COLOR)
+    table.add_column('p50', justify='right', no_wrap=True, style=COLOR)
+    table.add_column('p99', justify='right', no_wrap=True, style=COLOR)
+
+    tracing = profiler.mode == 'tracemalloc'
+
+    if tracing:
+        table.add_column('Peak memory', justify='right', no_wrap=True, style=COLOR)
+
+    for phase in profiler.phases():
+        peak = [f'{phase.peak_bytes / 2**20:.1f} MiB'] if tracing else []
+        table.add_row(phase.name, '1', format_seconds(phase.seconds), '', '', *peak)
+
+    table.add_section()
+
+    for call in profiler.calls():
+        p50, p99 = format_seconds(call.p50_seconds), format_seconds(call.p99_seconds)
+        table.add_row(call.name, f'{call.count:,}', format_seconds(call.total_seconds), p50, p99, *[''] * tracing)
+
+    return table
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f'{seconds * 1e6:.1f} µs'
+    if seconds < 1:
+        return f'{seconds * 1e3:.1f} ms'
+    return f'{seconds:.2f} s'
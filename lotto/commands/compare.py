@@ -0,0 +1,87 @@
+from pathlib import Path
+
+from rich.table import Table
+from rich.text import Text
+
+from ..comparison import ComparisonEngine
+from ..core import GameType, spawn_seeds
+from ..metrics import BacktestReport, MetricsCalculator
+from ..profiling import profiler
+from ..registry import StrategyRegistry
+from ..visualisation import visualise_comparison
+from .common import COLOR, SPINNER_TYPE, console, get_draw_results, metric_sections
+
+
+def run(
+    strategy_names: list[str],
+    params: dict[str, dict[str, str]],
+    date_from: str | None,
+    date_to: str | None,
+    top: int | None,
+    offline: bool,
+    seed: int | None,
+    resolution: str,
+    output: Path | None,
+) -> None:
+    data = get_draw_results(date_from, date_to, top, offline)
+    strategies = {}
+
+    with profiler.phase('resolve'):
+        for strategy_name, strategy_seed in zip(strategy_names, spawn_seeds(seed, len(strategy_names)), strict=True):
+            strategy = StrategyRegistry.resolve(strategy_name, params.get(strategy_name, {}))
+            strategy.seed(strategy_seed)
+            strategies[strategy_name] = profiler.instrument(strategy)
+
+    with (
+        console.status(f'Comparing {len(strategies)} strategies', spinner=SPINNER_TYPE, spinner_style=COLOR),
+        profiler.phase('backtest'),
+    ):
+        batches = ComparisonEngine(strategies).score(data)
+
+    with profiler.phase('metrics'):
+        calculators = {
+            strategy_name: MetricsCalculator.from_batches(strategy_batches)
+            for strategy_name, strategy_batches in batches.items()
+        }
+
+        lotto_reports = {name: calculator.generate_report(GameType.LOTTO) for name, calculator in calculators.items()}
+        lotto_plus_reports = {
+            name: calculator.generate_report(GameType.LOTTO_PLUS) for name, calculator in calculators.items()
+        }
+
+    console.print()
+    console.print(_get_comparison_table('Lotto - metrics', lotto_reports))
+    console.print()
+    console.print(_get_comparison_table('Lotto Plus - metrics', lotto_plus_reports))
+    console.print()
+
+    matches = {
+        strategy_name: {batch.game_type: batch.matches for batch in strategy_batches}
+        for strategy_name, strategy_batches in batches.items()
+    }
+
+    with profiler.phase('chart'):
+        visualise_comparison(data.draw_dates, matches, resolution, output)
+
+    if output:
+        console.print(f'Chart saved to [bold]{output}[/]')
+
+
+def _get_comparison_table(title: str, reports: dict[str, BacktestReport]) -> Table:
+    table = Table(title=Text(title, style='bold'))
+
+    table.add_column(Text('Metric', justify='center'), no_wrap=True)
+
+    for strategy_name in reports:
+        table.add_column(strategy_name, justify='right', style=COLOR)
+
+    columns = [metric_sections(report) for report in reports.values()]
+
+    for i, section in enumerate(columns[0]):
+        if i:
+            table.add_section()
+
+        for j, (name, _) in enumerate(section):
+            table.add_row(name, *[f'{sections[i][j][1]:.2f}' for sections in columns])
+
+    return table
@@ -0,0 +1,31 @@
+from ..cache import StateCache
+from ..core import DrawStore
+from ..profiling import profiler
+from ..registry import StrategyRegistry
+from .common import console, get_draw_results
+
+
+def run(
+    strategy_name: str,
+    params: dict[str, str],
+    date_from: str | None,
+    date_to: str | None,
+    top: int,
+    offline: bool,
+    seed: int | None,
+) -> None:
+    requires_data = StrategyRegistry.requires_data(strategy_name)
+
+    data = get_draw_results(date_from, date_to, top, offline) if requires_data else DrawStore.empty()
+
+    with profiler.phase('resolve'):
+        strategy = profiler.instrument(StrategyRegistry.resolve(strategy_name, params))
+        strategy.seed(seed)
+
+    with profiler.phase('prepare'):
+        StateCache.open_default().prepare(strategy, strategy_name, params, data)
+
+    with profiler.phase('generate'):
+        numbers = strategy.generate_numbers()
+
+    console.print(f'Generated numbers: [bold green]{", ".join(map(str, numbers))}[/]')
@@ -0,0 +1,23 @@
+import asyncio
+from functools import partial
+from pathlib import Path
+
+from .. import lotto_client
+from ..cache import StateCache
+from ..server import TicketServer
+from .common import console, get_draw_results
+
+
+def run(host: str, port: int, socket: Path | None, refresh: int, cache_size: int, offline: bool) -> None:
+    data = get_draw_results(None, None, None, offline)
+    load = partial(lotto_client.get_draw_results, None, None, None, offline)
+    server = TicketServer(load, data, refresh, cache_size, StateCache.open_default())
+
+    address = str(socket) if socket else f'http://{host}:{port}'
+    console.print(f'Serving [bold]{len(data)}[/] draws ({server.version}) on [bold]{address}[/]')
+    console.print('GET /generate?strategy=<name>&tickets=<n>&<param>=<value>, GET /health')
+
+    try:
+        asyncio.run(server.serve(host, port, str(socket) if socket else None))
+    except KeyboardInterrupt:
+        console.print('Server stopped')
@@ -0,0 +1,232 @@
+from contextlib import nullcontext
+from pathlib import Path
+
+import numpy as np
+import typer
+from rich.columns import Columns
+from rich.table import Table
+from rich.text import Text
+
+from ..analytic import AnalyticEvaluator
+from ..core import DrawStore, GameType
+from ..metrics import BacktestReport, MetricsCalculator
+from ..montecarlo import MonteCarloSimulation, MonteCarloSummary
+from ..profiling import ENGINE_METHODS, METRICS_METHODS, profiler
+from ..records import RecordWriter
+from ..registry import StrategyRegistry
+from ..simulation import BacktestEngine, WalkSchedule
+from ..visualisation import visualise_results
+from .common import COLOR, SPINNER_TYPE, console, get_draw_results, metric_sections, progress
+
+
+def run(
+    strategy_name: str,
+    params: dict[str, str],
+    date_from: str | None,
+    date_to: str | None,
+    top: int | None,
+    offline: bool,
+    runs: int,
+    workers: int | None,
+    analytic: bool,
+    tickets: int,
+    spill: Path | None,
+    resolution: str,
+    output: Path | None,
+    seed: int | None,
+    schedule: WalkSchedule,
+) -> None:
+    data = get_draw_results(date_from, date_to, top, offline)
+
+    if schedule.warmup >= len(data):
+        console.print(f'--warmup {schedule.warmup} leaves none of the {len(data)} draws to score', style='bold red')
+        raise typer.Exit(1)
+
+    if analytic:
+        with profiler.phase('analytic'):
+            _run_analytic(data, tickets)
+        return
+
+    if tickets > 1:
+        _run_portfolio(strategy_name, params, data, tickets, spill, seed)
+        return
+
+    if runs > 1:
+        _run_monte_carlo(strategy_name, params, data, runs, workers, seed)
+        return
+
+    with profiler.phase('resolve'):
+        strategy = profiler.instrument(StrategyRegistry.resolve(strategy_name, params))
+        strategy.seed(seed)
+
+    backtest = profiler.instrument(BacktestEngine(strategy, keep_history=False, schedule=schedule), ENGINE_METHODS)
+    metrics_calculator = profiler.instrument(MetricsCalculator(), METRICS_METHODS)
+
+    # records are folded into the metrics as they arrive, only the matches are kept for the chart
+    matches = {game_type: np.zeros(len(data), dtype=np.uint8) for game_type in GameType}
+    total_games = len(data) - schedule.warmup + int(data.has_plus[schedule.warmup :].sum())
+
+    with progress, _open_spill(spill) as writer, profiler.phase('backtest'):
+        task = progress.add_task('Backtest:', total=total_games)
+
+        for i, result in enumerate(backtest.results_gen(data)):
+            metrics_calculator.update(result)
+            matches[result.game_type][schedule.warmup + i // len(GameType)] = result.matches
+
+            if writer is not None:
+                writer.write(result)
+
+            progress.advance(task)
+
+    with profiler.phase('metrics'):
+        lotto_metrics = metrics_calculator.generate_report(GameType.LOTTO)
+        lotto_plus_metrics = metrics_calculator.generate_report(GameType.LOTTO_PLUS)
+
+    lotto_table = _get_metrics_table('Lotto - metrics', lotto_metrics)
+    lotto_plus_table = _get_metrics_table('Lotto Plus - metrics', lotto_plus_metrics)
+
+    console.print()
+    console.print(Columns([lotto_table, lotto_plus_table], padding=(0, 2)))
+    console.print()
+
+    _print_spill(spill)
+
+    scored = backtest.scored
+
+    if backtest.stopped_early:
+        stopped_at = data.draw_dates[scored.stop - 1]
+        console.print(
+            f'Stopped early at {stopped_at} after {scored.stop - scored.start} draws, the ROI sign is decided'
+        )
+        console.print()
+
+    with profiler.phase('chart'):
+        scored_matches = {game_type: game_matches[scored] for game_type, game_matches in matches.items()}
+        visualise_results(data.draw_dates[scored], scored_matches, strategy_name, resolution, output)
+
+    if output:
+        console.print(f'Chart saved to [bold]{output}[/]')
+
+
+def _run_monte_carlo(
+    strategy_name: str, params: dict[str, str], data: DrawStore, runs: int, workers: int | None, seed: int | None
+) -> None:
+    simulation = MonteCarloSimulation(strategy_name, params, runs, workers, seed)
+    results = []
+
+    with progress, profiler.phase('monte carlo'):
+        task = progress.add_task('Monte Carlo:', total=runs)
+
+        for result in simulation.results_gen(data):
+            results.append(result)
+            progress.advance(task)
+
+    with profiler.phase('metrics'):
+        lotto_summary = MonteCarloSimulation.summarise(results, GameType.LOTTO)
+        lotto_plus_summary = MonteCarloSimulation.summarise(results, GameType.LOTTO_PLUS)
+
+    lotto_table = _get_monte_carlo_table(f'Lotto - {runs} runs', lotto_summary)
+    lotto_plus_table = _get_monte_carlo_table(f'Lotto Plus - {runs} runs', lotto_plus_summary)
+
+    console.print()
+    console.print(Columns([lotto_table, lotto_plus_table], padding=(0, 2)))
+    console.print()
+
+
+def _run_portfolio(
+    strategy_name: str, params: dict[str, str], data: DrawStore, tickets: int, spill: Path | None, seed: int | None
+) -> None:
+    with profiler.phase('resolve'):
+        strategy = profiler.instrument(StrategyRegistry.resolve(strategy_name, params))
+        strategy.seed(seed)
+
+    if not strategy.supports_tickets:
+        console.print(f'"{strategy_name}" plays one ticket per draw and cannot build a portfolio', style='bold red')
+        raise typer.Exit(1)
+
+    backtest = BacktestEngine(strategy)
+    metrics_calculator = profiler.instrument(MetricsCalculator(), METRICS_METHODS)
+
+    with (
+        console.status(f'Scoring {tickets} tickets per draw', spinner=SPINNER_TYPE, spinner_style=COLOR),
+        _open_spill(spill) as writer,
+        profiler.phase('backtest'),
+    ):
+        for batch in backtest.score_portfolio(data, tickets):
+            metrics_calculator.update_batch(batch)
+
+            if writer is not None:
+                writer.write_batch(batch)
+
+    with profiler.phase('metrics'):
+        lotto_metrics = metrics_calculator.generate_report(GameType.LOTTO)
+        lotto_plus_metrics = metrics_calculator.generate_report(GameType.LOTTO_PLUS)
+
+    lotto_table = _get_metrics_table(f'Lotto - {tickets} tickets', lotto_metrics)
+    lotto_plus_table = _get_metrics_table(f'Lotto Plus - {tickets} tickets', lotto_plus_metrics)
+
+    console.print()
+    console.print(Columns([lotto_table, lotto_plus_table], padding=(0, 2)))
+    console.print()
+    _print_spill(spill)
+
+
+def _run_analytic(data: DrawStore, tickets: int) -> None:
+    evaluator = AnalyticEvaluator()
+
+    lotto_metrics = evaluator.generate_report(GameType.LOTTO, len(data), tickets)
+    lotto_plus_metrics = evaluator.generate_report(GameType.LOTTO_PLUS, len(data), tickets, int(data.has_plus.sum()))
+
+    lotto_table = _get_metrics_table('Lotto - expected', lotto_metrics)
+    lotto_plus_table = _get_metrics_table('Lotto Plus - expected', lotto_plus_metrics)
+
+    console.print()
+    console.print(Columns([lotto_table, lotto_plus_table], padding=(0, 2)))
+    console.print()
+
+
+def _open_spill(spill: Path | None) -> RecordWriter | nullcontext[None]:
+    return RecordWriter(spill) if spill else nullcontext()
+
+
+def _print_spill(spill: Path | None) -> None:
+    if spill:
+        console.print(f'Game records saved to [bold]{spill}[/]')
+
+
+def _get_metrics_table(title: str, report: BacktestReport) -> Table:
+    table = Table(title=Text(title, style='bold'))
+
+    table.add_column(Text('Metric', justify='center'), no_wrap=True)
+    table.add_column('Value', justify='right', style=COLOR)
+
+    for i, section in enumerate(metric_sections(report)):
+        if i:
+            table.add_section()
+
+        for name, value in section:
+            table.add_row(name, f'{value:.2f}')
+
+    return table
+
+
+def _get_monte_carlo_table(title: str, summary: MonteCarloSummary) -> Table:
+    table = Table(title=Text(title, style='bold'))
+
+    table.add_column(Text('Metric', justify='center'), no_wrap=True)
+    table.add_column('Mean', justify='right', style=COLOR)
+    table.add_column('Std dev', justify='right', style=COLOR)
+    table.add_column('95% CI', justify='right', style=COLOR)
+
+    metrics = [
+        ('roi_pct', summary.roi_pct),
+        ('hit_rate', summary.hit_rate),
+        ('max_drawdown', summary.max_drawdown),
+    ]
+
+    for name, metric in metrics:
+        table.add_row(
+            name, f'{metric.mean:.2f}', f'{metric.std_dev:.2f}', f'{metric.ci_low:.2f} - {metric.ci_high:.2f}'
+        )
+
+    return table
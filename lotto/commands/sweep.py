@@ -0,0 +1,64 @@
+from pathlib import Path
+
+from rich.table import Table
+from rich.text import Text
+
+from ..core import GameType
+from ..sweep import ParameterSweep, SweepResult
+from .common import COLOR, console, get_draw_results, progress
+
+
+def run(
+    strategy_name: str,
+    grid: dict[str, list[str]],
+    params: dict[str, str],
+    date_from: str | None,
+    date_to: str | None,
+    top: int | None,
+    offline: bool,
+    workers: int | None,
+    limit: int,
+    output: Path | None,
+) -> None:
+    data = get_draw_results(date_from, date_to, top, offline)
+
+    sweep = ParameterSweep(strategy_name, params, grid, workers)
+    results = []
+
+    with progress:
+        task = progress.add_task('Sweep:', total=len(sweep))
+
+        for result in sweep.results_gen(data):
+            results.append(result)
+            progress.advance(task)
+
+    ranked = ParameterSweep.rank(results)
+
+    console.print()
+    console.print(_get_sweep_table(f'{strategy_name} - top {min(limit, len(ranked))} of {len(ranked)}', ranked[:limit]))
+    console.print()
+
+    if output:
+        ParameterSweep.write(ranked, output)
+        console.print(f'Results saved to [bold]{output}[/]')
+
+
+def _get_sweep_table(title: str, results: list[SweepResult]) -> Table:
+    table = Table(title=Text(title, style='bold'))
+
+    table.add_column('#', justify='right')
+    table.add_column(Text('Params', justify='center'), no_wrap=True)
+    table.add_column('roi_pct', justify='right', style=COLOR)
+    table.add_column('lotto_hit_rate', justify='right', style=COLOR)
+    table.add_column('plus_hit_rate', justify='right', style=COLOR)
+
+    for rank, result in enumerate(results, start=1):
+        table.add_row(
+            str(rank),
+            ', '.join(f'{k}={v}' for k, v in result.params.items()),
+            f'{result.roi_pct:.2f}',
+            f'{result.reports[GameType.LOTTO].basic_accuracy.hit_rate:.4f}',
+            f'{result.reports[GameType.LOTTO_PLUS].basic_accuracy.hit_rate:.4f}',
+        )
+
+    return table
@@ -0,0 +1,63 @@
+import numpy as np
+
+from .core import AbstractStrategy, DrawStore, GameBatch, GameType, count_matches, encode_masks
+
+
+class ComparisonEngine:
+    def __init__(self, strategies: dict[str, AbstractStrategy]) -> None:
+        self._strategies = strategies
+
+    def score(self, data: DrawStore) -> dict[str, list[GameBatch]]:
+        shape = len(data), len(self._strategies), AbstractStrategy.TAKE
+        tickets = {game_type: np.zeros(shape, dtype=np.uint8) for game_type in GameType}
+        walked = []
+
+        for column, strategy in enumerate(self._strategies.values()):
+            if not strategy.supports_batch:
+                walked.append((column, strategy))
+                continue
+
+            for game_type in GameType:
+                tickets[game_type][:, column] = strategy.generate_batch(data)
+
+        if walked:
+            self._walk(data, walked, tickets)
+
+        # one match count per game type covers every strategy's tickets at once
+        matches = {
+            game_type: count_matches(data.masks(game_type)[:, None], encode_masks(game_tickets))
+            for game_type, game_tickets in tickets.items()
+        }
+
+        return {
+            name: [
+                GameBatch(
+                    game_type=game_type,
+                    draw_dates=data.draw_dates,
+                    draw_results=data.numbers(game_type),
+                    generated_numbers=tickets[game_type][:, column],
+                    matches=matches[game_type][:, column],
+                )
+                for game_type in GameType
+            ]
+            for column, name in enumerate(self._strategies)
+        }
+
+    @staticmethod
+    def _walk(data: DrawStore, walked: list[tuple[int, AbstractStrategy]], tickets: dict[GameType, np.ndarray]) -> None:
+        incremental = [strategy for _, strategy in walked if strategy.is_incremental]
+
+        for strategy in incremental:
+            strategy.prepare_data(data[:0])
+
+        # each draw is revealed once and fanned out to every strategy that can't score in batch
+        for cursor, record in enumerate(data):
+            for column, strategy in walked:
+                if not strategy.is_incremental:
+                    strategy.prepare_data(data[:cursor])
+
+                for game_type in GameType:
+                    tickets[game_type][cursor, column] = strategy.generate_numbers()
+
+            for strategy in incremental:
+                strategy.observe(record)
@@ -1,7 +1,14 @@
+import hashlib
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum, auto
+from typing import overload
+
+import numpy as np
+
+Seed = int | np.random.SeedSequence | None
 
 
 class GameType(Enum):
@@ -9,14 +16,14 @@ class GameType(Enum):
     LOTTO_PLUS = auto()
 
 
-@dataclass
+@dataclass(slots=True)
 class LottoDrawRecord:
     draw_date: datetime
     lotto_numbers: list[int]
     plus_numbers: list[int]
 
 
-@dataclass
+@dataclass(slots=True)
 class GameRecord:
     game_type: GameType
     draw_date: datetime
@@ -25,46 +32,405 @@ class GameRecord:
     matches: int
 
 
+@dataclass(frozen=True, eq=False)
+class GameBatch:
+    game_type: GameType
+    draw_dates: np.ndarray
+    draw_results: np.ndarray
+    generated_numbers: np.ndarray
+    matches: np.ndarray
+
+
+# bit for each number, 0 marks a missing draw and maps to no bit
+_NUMBER_BITS = np.concatenate(([0], np.uint64(1) << np.arange(63, dtype=np.uint64), np.zeros(192))).astype(np.uint64)
+
+
+def encode_masks(numbers: np.ndarray) -> np.ndarray:
+    numbers = np.asarray(numbers)
+    masks = np.zeros(numbers.shape[:-1], dtype=np.uint64)
+
+    # one column at a time keeps temporaries at a single mask per ticket for large portfolios
+    for column in np.moveaxis(numbers, -1, 0):
+        masks |= _NUMBER_BITS[column]
+
+    return masks
+
+
+def count_matches(draw_masks: np.ndarray, ticket_masks: np.ndarray) -> np.ndarray:
+    return np.bitwise_count(np.bitwise_and(draw_masks, ticket_masks)).astype(np.uint8)
+
+
+def spawn_seeds(seed: Seed, n: int) -> list[np.random.SeedSequence]:
+    # independent child streams, so parallel runs never share or repeat generator state
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return root.spawn(n)
+
+
+def sample_tickets(rng: np.random.Generator, size: int | tuple[int, ...]) -> np.ndarray:
+    shape = (size,) if isinstance(size, int) else size
+    columns = _draw_sorted_columns(rng, int(np.prod(shape)))
+    duplicated = np.flatnonzero(_has_duplicates(columns))
+
+    # rejection sampling: about a quarter of the rows repeat a number and get drawn again
+    while len(duplicated):
+        redrawn = _draw_sorted_columns(rng, len(duplicated))
+
+        for column, redrawn_column in zip(columns, redrawn, strict=True):
+            column[duplicated] = redrawn_column
+
+        duplicated = duplicated[_has_duplicates(redrawn)]
+
+    return np.stack(columns, axis=-1).reshape(*shape, AbstractStrategy.TAKE)
+
+
+# optimal 12-comparator network for six inputs, much cheaper than np.sort along a short axis
+_SORT_NETWORK = ((0, 5), (1, 3), (2, 4), (1, 2), (3, 4), (0, 3), (2, 5), (0, 1), (2, 3), (4, 5), (1, 2), (3, 4))
+
+
+def _draw_sorted_columns(rng: np.random.Generator, rows: int) -> list[np.ndarray]:
+    columns = [rng.integers(1, AbstractStrategy.POOL_MAX + 1, rows, dtype=np.uint8) for _ in range(6)]
+
+    for i, j in _SORT_NETWORK:
+        columns[i], columns[j] = np.minimum(columns[i], columns[j]), np.maximum(columns[i], columns[j])
+
+    return columns
+
+
+def _has_duplicates(columns: list[np.ndarray]) -> np.ndarray:
+    duplicated = columns[0] == columns[1]
+
+    for previous, column in zip(columns[1:], columns[2:], strict=False):
+        duplicated |= previous == column
+
+    return duplicated
+
+
+@dataclass(frozen=True, eq=False)
+class DrawStore:
+    draw_dates: np.ndarray
+    lotto_numbers: np.ndarray
+    plus_numbers: np.ndarray
+    lotto_masks: np.ndarray
+    plus_masks: np.ndarray
+    _cache: dict[object, np.ndarray] = field(default_factory=dict, init=False, repr=False)
+    # set on prefix slices, which read their per-draw tables as views of the parent's
+    _prefix_of: 'DrawStore | None' = field(default=None, repr=False)
+
+    @classmethod
+    def empty(cls) -> 'DrawStore':
+        return cls.from_records([])
+
+    @classmethod
+    def from_records(cls, records: Sequence[LottoDrawRecord]) -> 'DrawStore':
+        size = len(records)
+        draw_dates = np.array([r.draw_date for r in records], dtype='datetime64[D]').reshape(size)
+        lotto_numbers = np.zeros((size, AbstractStrategy.TAKE), dtype=np.uint8)
+        plus_numbers = np.zeros((size, AbstractStrategy.TAKE), dtype=np.uint8)
+
+        for i, record in enumerate(records):
+            lotto_numbers[i] = record.lotto_numbers
+            if record.plus_numbers:
+                plus_numbers[i] = record.plus_numbers
+
+        return cls.from_arrays(draw_dates, lotto_numbers, plus_numbers)
+
+    @classmethod
+    def concat(cls, stores: Sequence['DrawStore']) -> 'DrawStore':
+        if not stores:
+            return cls.empty()
+
+        return cls(
+            draw_dates=np.concatenate([s.draw_dates for s in stores]),
+            lotto_numbers=np.concatenate([s.lotto_numbers for s in stores]),
+            plus_numbers=np.concatenate([s.plus_numbers for s in stores]),
+            lotto_masks=np.concatenate([s.lotto_masks for s in stores]),
+            plus_masks=np.concatenate([s.plus_masks for s in stores]),
+        )
+
+    @classmethod
+    def from_arrays(cls, draw_dates: np.ndarray, lotto_numbers: np.ndarray, plus_numbers: np.ndarray) -> 'DrawStore':
+        return cls(
+            draw_dates=draw_dates,
+            lotto_numbers=lotto_numbers,
+            plus_numbers=plus_numbers,
+            lotto_masks=encode_masks(lotto_numbers),
+            plus_masks=encode_masks(plus_numbers),
+        )
+
+    @property
+    def has_plus(self) -> np.ndarray:
+        return self.plus_masks != 0
+
+    @property
+    def nbytes(self) -> int:
+        arrays = self.draw_dates, self.lotto_numbers, self.plus_numbers, self.lotto_masks, self.plus_masks
+        return sum(a.nbytes for a in arrays)
+
+    def numbers(self, game_type: GameType) -> np.ndarray:
+        return self.lotto_numbers if game_type == GameType.LOTTO else self.plus_numbers
+
+    def masks(self, game_type: GameType) -> np.ndarray:
+        return self.lotto_masks if game_type == GameType.LOTTO else self.plus_masks
+
+    def fingerprint(self) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+
+        for array in (self.draw_dates.view(np.int64), self.lotto_numbers, self.plus_numbers):
+            digest.update(np.ascontiguousarray(array).tobytes())
+
+        last_draw = np.datetime_as_string(self.draw_dates[-1], unit='D') if len(self) else '-'
+        return f'{last_draw}-{len(self)}-{digest.hexdigest()}'
+
+    @property
+    def index(self) -> 'DrawIndex':
+        return DrawIndex(self)
+
+    def cumulative_counts(self, game_type: GameType) -> np.ndarray:
+        if self._prefix_of is not None:
+            return self._prefix_of.cumulative_counts(game_type)[: len(self) + 1]
+
+        key = 'cumulative_counts', game_type
+
+        if key not in self._cache:
+            counts = np.zeros((len(self) + 1, AbstractStrategy.POOL_MAX), dtype=np.int32)
+            np.cumsum(self._presence(game_type), axis=0, out=counts[1:])
+            self._cache[key] = counts
+
+        return self._cache[key]
+
+    def last_seen(self, game_type: GameType) -> np.ndarray:
+        if self._prefix_of is not None:
+            return self._prefix_of.last_seen(game_type)[: len(self) + 1]
+
+        key = 'last_seen', game_type
+
+        if key not in self._cache:
+            draws = np.arange(len(self), dtype=np.int32)[:, None]
+            last_seen = np.full((len(self) + 1, AbstractStrategy.POOL_MAX), -1, dtype=np.int32)
+            np.maximum.accumulate(np.where(self._presence(game_type), draws, -1), axis=0, out=last_seen[1:])
+            self._cache[key] = last_seen
+
+        return self._cache[key]
+
+    def record(self, index: int) -> LottoDrawRecord:
+        plus_numbers = self.plus_numbers[index]
+
+        return LottoDrawRecord(
+            draw_date=self.draw_dates[index].item(),
+            lotto_numbers=self.lotto_numbers[index].tolist(),
+            plus_numbers=plus_numbers.tolist() if plus_numbers.any() else [],
+        )
+
+    def __len__(self) -> int:
+        return len(self.draw_dates)
+
+    def __iter__(self) -> Iterator[LottoDrawRecord]:
+        for i in range(len(self)):
+            yield self.record(i)
+
+    @overload
+    def __getitem__(self, key: int) -> LottoDrawRecord: ...
+
+    @overload
+    def __getitem__(self, key: slice) -> 'DrawStore': ...
+
+    def __getitem__(self, key: int | slice) -> 'LottoDrawRecord | DrawStore':
+        if not isinstance(key, slice):
+            return self.record(key)
+
+        is_prefix = key.start in (None, 0) and key.step in (None, 1)
+        root = self if self._prefix_of is None else self._prefix_of
+
+        return DrawStore(
+            draw_dates=self.draw_dates[key],
+            lotto_numbers=self.lotto_numbers[key],
+            plus_numbers=self.plus_numbers[key],
+            lotto_masks=self.lotto_masks[key],
+            plus_masks=self.plus_masks[key],
+            _prefix_of=root if is_prefix else None,
+        )
+
+    def _presence(self, game_type: GameType) -> np.ndarray:
+        pool = np.arange(AbstractStrategy.POOL_MAX, dtype=np.uint64)
+        return ((self.masks(game_type)[:, None] >> pool) & np.uint64(1)).astype(bool)
+
+
+class DrawIndex:
+    def __init__(self, data: DrawStore) -> None:
+        self._data = data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def window_counts(self, start: int, end: int, game_type: GameType = GameType.LOTTO) -> np.ndarray:
+        cumulative = self._data.cumulative_counts(game_type)
+        return cumulative[end] - cumulative[start]
+
+    def window_counts_batch(
+        self, starts: np.ndarray, ends: np.ndarray, game_type: GameType = GameType.LOTTO
+    ) -> np.ndarray:
+        cumulative = self._data.cumulative_counts(game_type)
+        return cumulative[ends] - cumulative[starts]
+
+    def lookback_counts(
+        self, lookback: int, end: int | None = None, game_type: GameType = GameType.LOTTO
+    ) -> np.ndarray:
+        end = len(self) if end is None else end
+        start = max(end - lookback, 0) if lookback else 0
+        return self.window_counts(start, end, game_type)
+
+    def draws_since(self, end: int | None = None, game_type: GameType = GameType.LOTTO) -> np.ndarray:
+        # draws between the last appearance of each number and `end`, numbers never drawn count from the start
+        end = len(self) if end is None else end
+        return end - 1 - self._data.last_seen(game_type)[end]
+
+
+class RollingFrequencyIndex:
+    def __init__(self, window: int = 0, pool_max: int = 49) -> None:
+        self._window = window
+        self._pool_max = pool_max
+        self._counts = [0] * (pool_max + 1)
+        self._buffer: list[list[int] | None] = [None] * window
+        self._head = 0
+        self._size = 0
+        self._ranked = list(range(1, pool_max + 1))
+        self._positions = [-1, *range(pool_max)]
+
+    @classmethod
+    def from_window(
+        cls, counts: Sequence[int], size: int, recent: list[list[int]], window: int = 0, pool_max: int = 49
+    ) -> 'RollingFrequencyIndex':
+        # seed from precomputed counts instead of replaying every push, `recent` only fills the eviction buffer
+        index = cls(window, pool_max)
+        index._counts = [0, *map(int, counts)]
+        index._ranked.sort(key=lambda n: (-index._counts[n], n))
+        index._positions = [-1] * (pool_max + 1)
+        index._size = size
+
+        for pos, number in enumerate(index._ranked):
+            index._positions[number] = pos
+
+        if window:
+            recent = recent[-window:]
+            index._buffer[: len(recent)] = recent
+            index._head = len(recent) % window
+
+        return index
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def window(self) -> int:
+        return self._window
+
+    def count(self, number: int) -> int:
+        return self._counts[number]
+
+    def counts(self) -> list[int]:
+        return self._counts[1:]
+
+    def top(self, k: int) -> list[int]:
+        return self._ranked[:k]
+
+    def push(self, numbers: list[int]) -> None:
+        numbers = [n for n in numbers if 1 <= n <= self._pool_max]
+
+        if self._window:
+            evicted = self._buffer[self._head]
+            self._buffer[self._head] = numbers
+            self._head = (self._head + 1) % self._window
+
+            if evicted is None:
+                self._size += 1
+            else:
+                for n in evicted:
+                    self._decrement(n)
+        else:
+            self._size += 1
+
+        for n in numbers:
+            self._increment(n)
+
+    def _increment(self, number: int) -> None:
+        counts, ranked, positions = self._counts, self._ranked, self._positions
+        counts[number] += 1
+        count = counts[number]
+        pos = positions[number]
+
+        while pos > 0:
+            prev = ranked[pos - 1]
+            if counts[prev] > count or (counts[prev] == count and prev < number):
+                break
+            ranked[pos] = prev
+            positions[prev] = pos
+            pos -= 1
+
+        ranked[pos] = number
+        positions[number] = pos
+
+    def _decrement(self, number: int) -> None:
+        counts, ranked, positions = self._counts, self._ranked, self._positions
+        counts[number] -= 1
+        count = counts[number]
+        pos = positions[number]
+        last = len(ranked) - 1
+
+        while pos < last:
+            nxt = ranked[pos + 1]
+            if counts[nxt] < count or (counts[nxt] == count and nxt > number):
+                break
+            ranked[pos] = nxt
+            positions[nxt] = pos
+            pos += 1
+
+        ranked[pos] = number
+        positions[number] = pos
+
+
 class AbstractStrategy(ABC):
     POOL_MAX = 49
     TAKE = 6
 
     @abstractmethod
-    def prepare_data(self, data: list[LottoDrawRecord]) -> None:
+    def prepare_data(self, data: DrawStore) -> None:
         raise NotImplementedError
 
     @abstractmethod
     def generate_numbers(self) -> list[int]:
         raise NotImplementedError
 
+    def observe(self, record: LottoDrawRecord) -> None:
+        raise NotImplementedError
 
-@dataclass
-class StrategyMetadata:
-    requires_data: bool = True
-    has_params: bool = True
+    def generate_batch(self, data: DrawStore) -> np.ndarray:
+        raise NotImplementedError
 
+    def generate_tickets(self, k: int) -> list[list[int]]:
+        return [self.generate_numbers() for _ in range(k)]
 
-class StrategyRegistry:
-    _registry: dict[str, tuple[type[AbstractStrategy], StrategyMetadata]] = {}
+    def generate_tickets_batch(self, data: DrawStore, k: int) -> np.ndarray:
+        if k == 1 and self.supports_batch:
+            return np.asarray(self.generate_batch(data), dtype=np.uint8)[:, None]
 
-    @classmethod
-    def register(cls, name: str, metadata: StrategyMetadata | None = None) -> callable:
-        def wrapper(strategy_type: type[AbstractStrategy]) -> type[AbstractStrategy]:
-            cls._registry[name] = strategy_type, metadata or StrategyMetadata()
-            return strategy_type
+        raise NotImplementedError
 
-        return wrapper
+    def seed(self, seed: Seed) -> None:  # noqa: B027
+        pass
 
-    @classmethod
-    def requires_data(cls, name: str) -> bool:
-        _, metadata = cls._registry.get(name)
-        return metadata.requires_data
+    @property
+    def is_incremental(self) -> bool:
+        return type(self).observe is not AbstractStrategy.observe
 
-    @classmethod
-    def list_strategies(cls) -> list[str]:
-        return list(cls._registry.keys())
+    @property
+    def supports_batch(self) -> bool:
+        return type(self).generate_batch is not AbstractStrategy.generate_batch
 
-    @classmethod
-    def resolve(cls, name: str, params: dict[str, str]) -> AbstractStrategy:
-        strategy_type, metadata = cls._registry.get(name)
-        return strategy_type(params) if metadata.has_params else strategy_type()
+    # the default repeats generate_numbers, which only makes a portfolio when the strategy is random
+    @property
+    def supports_tickets(self) -> bool:
+        return type(self).generate_tickets is not AbstractStrategy.generate_tickets
+
+    def supports_tickets_batch(self, k: int) -> bool:
+        overridden = type(self).generate_tickets_batch is not AbstractStrategy.generate_tickets_batch
+        return overridden or (k == 1 and self.supports_batch)
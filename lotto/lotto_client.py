@@ -1,10 +1,29 @@
-from datetime import datetime
+import codecs
+import json
+import re
+from array import array
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from functools import lru_cache, partial
 from typing import TypedDict, cast
 
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from .core import LottoDrawRecord
-from .settings import config
+from .cache import DrawCache
+from .core import AbstractStrategy, DrawStore
+from .settings import get_config
+
+FIRST_DRAW_DATE = date(1957, 1, 27)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+CHUNK_SIZE = 64 * 1024
+ISO_DATE_FORMAT = '%Y-%m-%d'
+
+_WHITESPACE = re.compile(r'\s*')
+_ARRAY_SEPARATORS = re.compile(r'[\s,]*')
 
 
 class RawLottoDrawRecord(TypedDict):
@@ -13,30 +32,184 @@ class RawLottoDrawRecord(TypedDict):
     plus_numbers: list[int]
 
 
-def get_draw_results(date_from: str | None, date_to: str | None, top: int | None) -> list[LottoDrawRecord]:
-    url = _build_url('/api/draw-results')
+class LottoClient:
+    def __init__(self, workers: int | None = None) -> None:
+        config = get_config()
+        self._workers = workers or config.api.workers
+        self._session = requests.Session()
+
+        retry = Retry(
+            total=config.api.retries,
+            backoff_factor=config.api.backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=('GET',),
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_maxsize=self._workers)
+
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._session.headers.update(
+            {
+                'Accept': 'application/json',
+                'Accept-Encoding': 'gzip, deflate',
+                'x-functions-key': config.api.api_key,
+            }
+        )
+
+    def __enter__(self) -> 'LottoClient':
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._session.close()
+
+    def get_draw_results(self, date_from: str | None, date_to: str | None, top: int | None) -> DrawStore:
+        url = _build_url('/api/draw-results')
+
+        params = {'dateFrom': date_from, 'dateTo': date_to, 'top': top}
+        params = {k: v for k, v in params.items() if v is not None}
+
+        with self._session.get(url, params=params, timeout=get_config().api.timeout, stream=True) as response:
+            response.raise_for_status()
+            records = iter_json_array(response.iter_content(chunk_size=CHUNK_SIZE))
+            return build_draw_store(cast('Iterator[RawLottoDrawRecord]', records))
+
+    def get_draw_results_windowed(self, date_from: date, date_to: date) -> DrawStore:
+        windows = _split_into_years(date_from, date_to)
+
+        if len(windows) == 1:
+            return self._get_window(windows[0])
+
+        with ThreadPoolExecutor(self._workers) as executor:
+            return DrawStore.concat(list(executor.map(self._get_window, windows)))
+
+    def _get_window(self, window: tuple[date, date]) -> DrawStore:
+        date_from, date_to = (d.strftime(get_config().app.date_format) for d in window)
+        return self.get_draw_results(date_from, date_to, None)
+
+
+def get_draw_results(date_from: str | None, date_to: str | None, top: int | None, offline: bool = False) -> DrawStore:
+    with DrawCache.open_default() as cache:
+        if not offline and not cache.is_fresh():
+            _sync(cache)
+
+        return cache.query(_parse_date(date_from), _parse_date(date_to), top)
+
+
+def sync_draw_results() -> int:
+    with DrawCache.open_default() as cache:
+        return _sync(cache)
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[object]:
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    opened = False
+
+    for chunk in chunks:
+        buffer += text_decoder.decode(chunk)
+        pos = 0
+
+        while True:
+            pos = (_ARRAY_SEPARATORS if opened else _WHITESPACE).match(buffer, pos).end()
+
+            if pos == len(buffer):
+                break
 
-    headers = {'Accept': 'application/json', 'x-functions-key': config.api.api_key}
+            # the body must be a single top-level array, anything else is an error payload or garbage
+            if not opened:
+                if buffer[pos] != '[':
+                    raise ValueError(f'Expected a JSON array, got {buffer[pos]!r}')
 
-    params = {'dateFrom': date_from, 'dateTo': date_to, 'top': top}
-    params = {k: v for k, v in params.items() if v is not None}
+                opened = True
+                pos += 1
+                continue
 
-    response = requests.get(url, params=params, headers=headers, timeout=config.api.timeout)
-    response.raise_for_status()
+            if buffer[pos] == ']':
+                return
 
-    body = cast('list[RawLottoDrawRecord]', response.json())
-    return [_map_record(record) for record in body]
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # the item continues in the next chunk
+                break
 
+            yield item
 
-def _map_record(record: RawLottoDrawRecord) -> LottoDrawRecord:
-    return LottoDrawRecord(
-        draw_date=datetime.strptime(record['draw_date'], config.app.date_format).date(),
-        lotto_numbers=record['lotto_numbers'],
-        plus_numbers=record['plus_numbers'],
+        buffer = buffer[pos:]
+
+    if buffer.strip():
+        raise ValueError(f'Unexpected end of JSON array: {buffer[:50]!r}')
+
+    raise ValueError('Unexpected end of JSON array: missing "]"' if opened else 'Expected a JSON array, got nothing')
+
+
+def build_draw_store(records: Iterable[RawLottoDrawRecord], date_format: str | None = None) -> DrawStore:
+    parse_date = _get_date_parser(date_format or get_config().app.date_format)
+    no_plus_numbers = bytes(AbstractStrategy.TAKE)
+
+    draw_dates = []
+    lotto_numbers = array('B')
+    plus_numbers = array('B')
+
+    for record in records:
+        draw_dates.append(parse_date(record['draw_date']))
+        lotto_numbers.extend(record['lotto_numbers'])
+
+        if record['plus_numbers']:
+            plus_numbers.extend(record['plus_numbers'])
+        else:
+            plus_numbers.frombytes(no_plus_numbers)
+
+    return DrawStore.from_arrays(
+        np.array(draw_dates, dtype='datetime64[D]'),
+        np.frombuffer(lotto_numbers, dtype=np.uint8).reshape(-1, AbstractStrategy.TAKE),
+        np.frombuffer(plus_numbers, dtype=np.uint8).reshape(-1, AbstractStrategy.TAKE),
     )
 
 
+def _get_date_parser(date_format: str) -> Callable[[str], date]:
+    if date_format == ISO_DATE_FORMAT:
+        return date.fromisoformat
+
+    return partial(_parse_draw_date, date_format=date_format)
+
+
+@lru_cache(maxsize=32768)
+def _parse_draw_date(date_str: str, date_format: str) -> date:
+    return datetime.strptime(date_str, date_format).date()
+
+
+def _sync(cache: DrawCache) -> int:
+    last_draw_date = cache.last_draw_date()
+    date_from = last_draw_date + timedelta(days=1) if last_draw_date else FIRST_DRAW_DATE
+
+    with LottoClient() as client:
+        data = client.get_draw_results_windowed(date_from, date.today())
+
+    cache.store(data)
+    return len(data)
+
+
+def _split_into_years(date_from: date, date_to: date) -> list[tuple[date, date]]:
+    windows = []
+
+    while date_from <= date_to:
+        window_end = min(date(date_from.year, 12, 31), date_to)
+        windows.append((date_from, window_end))
+        date_from = window_end + timedelta(days=1)
+
+    return windows
+
+
+def _parse_date(date_str: str | None) -> date | None:
+    return datetime.strptime(date_str, get_config().app.date_format).date() if date_str else None
+
+
 def _build_url(path: str) -> str:
-    url = config.api.base_url
+    url = get_config().api.base_url
     url = url[:-1] if url.endswith('/') else url
     return f'{url}/{path.lstrip("/")}'
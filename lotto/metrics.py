@@ -1,12 +1,10 @@
-import math
-import statistics
-from collections import Counter
 from collections.abc import Iterable
 from dataclasses import dataclass
 
-from scipy.stats import chisquare
+import numpy as np
 
-from .core import GameRecord, GameType
+from .core import AbstractStrategy, GameBatch, GameRecord, GameType
+from .stats import chi_square, entropy
 
 
 @dataclass
@@ -27,7 +25,7 @@ class MonetaryMetrics:
     roi_pct: float
     expected_value: float
     variance_of_returns: float
-    max_drawdown: int
+    max_drawdown: float | None
     winning_distribution: dict[int, int]
 
 
@@ -47,7 +45,106 @@ class StatisticalMetrics:
 class BacktestReport:
     basic_accuracy: BasicMetrics
     monetary_metrics: MonetaryMetrics
-    statistical_quality: StatisticalMetrics
+    statistical_quality: StatisticalMetrics | None
+
+
+class _RunningMoments:
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else 0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def add_batch(self, values: np.ndarray) -> None:
+        if not values.size:
+            return
+
+        # Chan et al. pairwise merge of the batch moments into the running ones
+        count = values.size
+        mean = float(values.mean())
+        m2 = float(((values - mean) ** 2).sum())
+        total = self.count + count
+        delta = mean - self.mean
+
+        self.mean += delta * count / total
+        self._m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+
+class _RunningStreak:
+    def __init__(self, min_hits: int) -> None:
+        self._min_hits = min_hits
+        self.current = 0
+        self.longest = 0
+
+    def add(self, value: int) -> None:
+        if value >= self._min_hits:
+            self.current += 1
+            self.longest = max(self.longest, self.current)
+        else:
+            self.current = 0
+
+    def add_batch(self, values: np.ndarray) -> None:
+        misses = np.flatnonzero(values < self._min_hits)
+
+        if not len(misses):
+            self.current += len(values)
+            self.longest = max(self.longest, self.current)
+            return
+
+        runs = np.diff(np.concatenate(([-1], misses))) - 1
+        runs[0] += self.current
+        self.current = len(values) - int(misses[-1]) - 1
+        self.longest = max(self.longest, int(runs.max()), self.current)
+
+
+class _RunningDrawdown:
+    def __init__(self) -> None:
+        self.balance = 0.0
+        self.peak = 0.0
+        self.largest = 0.0
+
+    def add(self, net: float) -> None:
+        self.balance += net
+        self.peak = max(self.peak, self.balance)
+        self.largest = max(self.largest, self.peak - self.balance)
+
+    def add_batch(self, nets: np.ndarray) -> None:
+        if not nets.size:
+            return
+
+        # the running peak starts from wherever the previous batch left off
+        balance = self.balance + np.cumsum(nets, dtype=np.float64)
+        peak = np.maximum(np.maximum.accumulate(balance), self.peak)
+
+        self.largest = max(self.largest, float((peak - balance).max()))
+        self.balance = float(balance[-1])
+        self.peak = float(peak[-1])
+
+
+class _GameStats:
+    def __init__(self, prizes: np.ndarray, cost: float, take: int, pool_max: int) -> None:
+        self.prizes = prizes
+        self.cost = cost
+        self.prize_list = prizes.tolist()
+        self.draws = 0
+        self.match_counts = [0] * (take + 1)
+        self.frequency = [0] * (pool_max + 1)
+        self.parity_counts = [0] * (take + 1)
+        self.total_winnings = 0
+        self.winnings = _RunningMoments()
+        self.sums = _RunningMoments()
+        self.hit_streak = _RunningStreak(min_hits=1)
+        self.drawdown = _RunningDrawdown()
 
 
 class MetricsCalculator:
@@ -59,10 +156,81 @@ class MetricsCalculator:
         GameType.LOTTO: 3.0,
         GameType.LOTTO_PLUS: 1.0,
     }
+    POOL_MAX = AbstractStrategy.POOL_MAX
+
+    # everything is accumulated online, so memory stays constant no matter how many games are fed in
+    def __init__(self, records: Iterable[GameRecord] = ()) -> None:
+        take = AbstractStrategy.TAKE
+        self._games = {
+            game_type: _GameStats(
+                self._prize_lookup(game_type, take), self.TICKET_COSTS[game_type], take, self.POOL_MAX
+            )
+            for game_type in GameType
+        }
 
-    def __init__(self, records: Iterable[GameRecord]) -> None:
-        self._lotto_records = [r for r in records if r.game_type == GameType.LOTTO]
-        self._lotto_plus_records = [r for r in records if r.game_type == GameType.LOTTO_PLUS]
+        for record in records:
+            self.update(record)
+
+    @classmethod
+    def from_arrays(
+        cls, matches: dict[GameType, np.ndarray], generated_numbers: dict[GameType, np.ndarray]
+    ) -> 'MetricsCalculator':
+        calculator = cls()
+
+        for game_type in matches:
+            calculator.update_arrays(game_type, matches[game_type], generated_numbers[game_type])
+
+        return calculator
+
+    @classmethod
+    def from_batches(cls, batches: Iterable[GameBatch]) -> 'MetricsCalculator':
+        calculator = cls()
+
+        for batch in batches:
+            calculator.update_batch(batch)
+
+        return calculator
+
+    def update(self, record: GameRecord) -> None:
+        stats = self._games[record.game_type]
+        matches = record.matches
+        winnings = stats.prize_list[matches]
+
+        stats.draws += 1
+        stats.match_counts[matches] += 1
+        stats.total_winnings += winnings
+        stats.winnings.add(winnings)
+        stats.hit_streak.add(matches)
+        stats.drawdown.add(winnings - stats.cost)
+
+        even = 0
+        for number in record.generated_numbers:
+            stats.frequency[number] += 1
+            even += number % 2 == 0
+
+        stats.parity_counts[even] += 1
+        stats.sums.add(sum(record.generated_numbers))
+
+    def update_batch(self, batch: GameBatch) -> None:
+        self.update_arrays(batch.game_type, batch.matches, batch.generated_numbers)
+
+    def update_arrays(self, game_type: GameType, matches: np.ndarray, generated_numbers: np.ndarray) -> None:
+        stats = self._games[game_type]
+        matches, generated_numbers = self._as_arrays(matches, generated_numbers)
+        take = generated_numbers.shape[1]
+        winnings = stats.prizes[matches]
+
+        stats.draws += len(matches)
+        self._add_counts(stats.match_counts, np.bincount(matches.ravel(), minlength=take + 1))
+        stats.total_winnings += int(winnings.sum())
+        stats.winnings.add_batch(winnings)
+        stats.hit_streak.add_batch(matches.max(axis=1, initial=0))
+        stats.drawdown.add_batch(winnings.sum(axis=1) - winnings.shape[1] * stats.cost)
+
+        even_counts = np.count_nonzero(generated_numbers % 2 == 0, axis=1)
+        self._add_counts(stats.frequency, np.bincount(generated_numbers.ravel(), minlength=self.POOL_MAX + 1))
+        self._add_counts(stats.parity_counts, np.bincount(even_counts, minlength=take + 1))
+        stats.sums.add_batch(generated_numbers.sum(axis=1, dtype=np.int64))
 
     def generate_report(self, game_type: GameType) -> BacktestReport:
         return BacktestReport(
@@ -72,120 +240,90 @@ class MetricsCalculator:
         )
 
     def calculate_basic_metrics(self, game_type: GameType) -> BasicMetrics:
-        records = self._get_records_for_game_type(game_type)
-        matches = [r.matches for r in records]
-
-        match_distribution = Counter(matches)
-        total_draws = len(records)
-        hit_rate = sum(1 for m in matches if m >= 1) / total_draws
-        average_hits = statistics.mean(matches)
-        max_streak = self._calculate_max_streak(matches, min_hits=1)
+        stats = self._games[game_type]
+        match_counts = np.array(stats.match_counts)
+        total_bets = int(match_counts.sum())
+        match_distribution = self._to_distribution(np.arange(len(match_counts)), match_counts)
 
         return BasicMetrics(
-            total_draws=total_draws,
-            hit_rate=hit_rate,
-            max_streak=max_streak,
-            average_hits_per_bet=average_hits,
+            total_draws=stats.draws,
+            hit_rate=float(total_bets - match_counts[0]) / total_bets if total_bets else 0,
+            max_streak=stats.hit_streak.longest,
+            average_hits_per_bet=float(match_counts @ np.arange(len(match_counts))) / total_bets if total_bets else 0,
             match_distribution=match_distribution,
-            match_distribution_pct={k: v / total_draws for k, v in match_distribution.items()},
+            match_distribution_pct={k: v / total_bets for k, v in match_distribution.items()},
         )
 
     def calculate_monetary_metrics(self, game_type: GameType) -> MonetaryMetrics:
-        records = self._get_records_for_game_type(game_type)
-        ticket_cost = self.TICKET_COSTS[game_type]
-
-        total_cost = len(records) * ticket_cost
-        winnings = []
-
-        for record in records:
-            prize_table = self.PRIZE_TABLES[record.game_type]
-            win_amount = prize_table.get(record.matches, 0)
-            winnings.append(win_amount)
-
-        total_winnings = sum(winnings)
-        net_profit = total_winnings - total_cost
+        stats = self._games[game_type]
+        total_cost = stats.winnings.count * self.TICKET_COSTS[game_type]
+        net_profit = stats.total_winnings - total_cost
         roi = (net_profit / total_cost) * 100 if total_cost > 0 else 0
-        expected_value = statistics.mean(winnings) if winnings else 0
-        variance = statistics.variance(winnings) if len(winnings) > 1 else 0
-        win_streaks = [1 if w > 0 else 0 for w in winnings]
-        max_drawdown = self._calculate_max_streak(win_streaks, min_hits=0)
+
+        winning_distribution: dict[int, int] = {}
+        for prize, count in zip(stats.prize_list, stats.match_counts, strict=True):
+            if count:
+                winning_distribution[prize] = winning_distribution.get(prize, 0) + count
 
         return MonetaryMetrics(
-            total_winnings=total_winnings,
+            total_winnings=stats.total_winnings,
             total_cost=total_cost,
             net_profit=net_profit,
             roi_pct=roi,
-            expected_value=expected_value,
-            variance_of_returns=variance,
-            max_drawdown=max_drawdown,
-            winning_distribution=Counter(winnings),
+            expected_value=stats.winnings.mean,
+            variance_of_returns=stats.winnings.variance,
+            max_drawdown=stats.drawdown.largest,
+            winning_distribution=winning_distribution,
         )
 
     def calculate_statistical_metrics(self, game_type: GameType) -> StatisticalMetrics:
-        records = self._get_records_for_game_type(game_type)
-
-        all_generated = []
-        sum_metrics = []
-        parity_metrics = []
+        stats = self._games[game_type]
+        take = len(stats.parity_counts) - 1
+        frequency = np.array(stats.frequency[1 : self.POOL_MAX + 1])
 
-        for record in records:
-            numbers = record.generated_numbers
-            all_generated.extend(numbers)
-            sum_metrics.append(sum(numbers))
-            even_count = sum(1 for n in numbers if n % 2 == 0)
-            parity_metrics.append((even_count, 6 - even_count))
-
-        coverage = len(set(all_generated))
-        coverage_percentage = (coverage / 49) * 100
-        number_frequency = Counter(all_generated)
-        _, chi2_pvalue = self._chi_square_test(number_frequency)
-        entropy = self._calculate_entropy(number_frequency)
-        avg_sum = statistics.mean(sum_metrics)
-        sum_std = statistics.stdev(sum_metrics) if len(sum_metrics) > 1 else 0
-        parity_dist = Counter(parity_metrics)
+        coverage = int(np.count_nonzero(frequency))
+        _, chi2_pvalue = self._chi_square_test(frequency)
 
         return StatisticalMetrics(
             coverage=coverage,
-            coverage_pct=coverage_percentage,
-            number_frequency=dict(number_frequency),
+            coverage_pct=(coverage / self.POOL_MAX) * 100,
+            number_frequency=self._to_distribution(np.arange(1, self.POOL_MAX + 1), frequency),
             chi_square_pvalue=chi2_pvalue,
-            entropy=entropy,
-            average_sum=avg_sum,
-            sum_std_dev=sum_std,
-            parity_distribution={f'{even}/{odd}': count for (even, odd), count in parity_dist.items()},
+            entropy=entropy(frequency),
+            average_sum=stats.sums.mean,
+            sum_std_dev=float(np.sqrt(stats.sums.variance)),
+            parity_distribution={
+                f'{even}/{take - even}': count for even, count in enumerate(stats.parity_counts) if count
+            },
         )
 
-    def _calculate_max_streak(self, matches: list[int], min_hits: int = 1) -> int:
-        current_streak = 0
-        max_streak = 0
-
-        for match in matches:
-            if match >= min_hits:
-                current_streak += 1
-                max_streak = max(max_streak, current_streak)
-            else:
-                current_streak = 0
+    def _chi_square_test(self, frequency: np.ndarray) -> tuple[float, float]:
+        if frequency.sum() > 0:
+            return chi_square(frequency)
+        return 0, 1
 
-        return max_streak
+    def _prize_lookup(self, game_type: GameType, take: int) -> np.ndarray:
+        prizes = np.zeros(take + 1, dtype=np.int64)
 
-    def _chi_square_test(self, frequency: Counter) -> tuple[float, float]:
-        expected = sum(frequency.values()) / 49
-        observed = [frequency.get(i, 0) for i in range(1, 50)]
-        expected_list = [expected] * 49
+        for matches, prize in self.PRIZE_TABLES[game_type].items():
+            prizes[matches] = prize
 
-        if expected > 0:
-            chi2, p_value = chisquare(observed, expected_list)
-            return chi2, p_value
-        return 0, 1
+        return prizes
 
-    def _calculate_entropy(self, frequency: Counter) -> float:
-        total = sum(frequency.values())
-        if total == 0:
-            return 0
+    @staticmethod
+    def _add_counts(totals: list[int], counts: np.ndarray) -> None:
+        for i, count in enumerate(counts.tolist()):
+            totals[i] += count
 
-        probabilities = [count / total for count in frequency.values()]
-        entropy = -sum(p * math.log2(p) for p in probabilities if p > 0)
-        return entropy
+    @staticmethod
+    def _to_distribution(keys: np.ndarray, counts: np.ndarray) -> dict[int, int]:
+        present = counts > 0
+        return dict(zip(keys[present].tolist(), counts[present].tolist(), strict=True))
 
-    def _get_records_for_game_type(self, game_type: GameType) -> list[GameRecord]:
-        return self._lotto_records if game_type == GameType.LOTTO else self._lotto_plus_records
+    @staticmethod
+    def _as_arrays(matches: Iterable[int], generated_numbers: Iterable[Iterable[int]]) -> tuple[np.ndarray, np.ndarray]:
+        # one row per draw, one column per ticket of the portfolio
+        matches = np.asarray(matches, dtype=np.uint8)
+        matches = matches.reshape(len(matches), -1) if matches.size else matches.reshape(0, 1)
+        generated_numbers = np.asarray(generated_numbers, dtype=np.uint8).reshape(-1, AbstractStrategy.TAKE)
+        return matches, generated_numbers
@@ -0,0 +1,72 @@
+import math
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from statistics import NormalDist
+
+import numpy as np
+
+from .core import DrawStore, GameType, Seed, spawn_seeds
+from .metrics import BacktestReport
+from .parallel import BacktestPool, BacktestTask
+
+
+@dataclass
+class RunResult:
+    run: int
+    reports: dict[GameType, BacktestReport]
+
+
+@dataclass
+class MetricSummary:
+    mean: float
+    std_dev: float
+    ci_low: float
+    ci_high: float
+
+
+@dataclass
+class MonteCarloSummary:
+    runs: int
+    roi_pct: MetricSummary
+    hit_rate: MetricSummary
+    max_drawdown: MetricSummary
+
+
+class MonteCarloSimulation:
+    def __init__(
+        self,
+        strategy_name: str,
+        params: dict[str, str],
+        runs: int,
+        workers: int | None = None,
+        seed: Seed = None,
+    ) -> None:
+        seeds = spawn_seeds(seed, runs)
+        self._tasks = [BacktestTask(strategy_name, params, run_seed) for run_seed in seeds]
+        self._workers = workers
+
+    def results_gen(self, data: DrawStore) -> Iterator[RunResult]:
+        pool = BacktestPool(data, self._workers)
+
+        for run, reports in pool.results_gen(self._tasks):
+            yield RunResult(run, reports)
+
+    @staticmethod
+    def summarise(results: Iterable[RunResult], game_type: GameType, confidence: float = 0.95) -> MonteCarloSummary:
+        reports = [result.reports[game_type] for result in results]
+
+        return MonteCarloSummary(
+            runs=len(reports),
+            roi_pct=_summarise([r.monetary_metrics.roi_pct for r in reports], confidence),
+            hit_rate=_summarise([r.basic_accuracy.hit_rate for r in reports], confidence),
+            max_drawdown=_summarise([r.monetary_metrics.max_drawdown for r in reports], confidence),
+        )
+
+
+def _summarise(values: list[float], confidence: float) -> MetricSummary:
+    samples = np.asarray(values, dtype=np.float64)
+    mean = float(samples.mean())
+    std_dev = float(samples.std(ddof=1)) if len(samples) > 1 else 0.0
+    margin = NormalDist().inv_cdf(0.5 + confidence / 2) * std_dev / math.sqrt(len(samples))
+
+    return MetricSummary(mean=mean, std_dev=std_dev, ci_low=mean - margin, ci_high=mean + margin)
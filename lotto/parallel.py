@@ -0,0 +1,109 @@
+import os
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from .core import DrawStore, GameType, Seed
+from .metrics import BacktestReport, MetricsCalculator
+from .registry import StrategyRegistry
+from .simulation import BacktestEngine
+
+_STORE_FIELDS = ('draw_dates', 'lotto_numbers', 'plus_numbers', 'lotto_masks', 'plus_masks')
+
+_ArraySpec = tuple[str, str, tuple[int, ...], str]
+
+
+@dataclass
+class BacktestTask:
+    strategy_name: str
+    params: dict[str, str]
+    seed: Seed = None
+
+
+class SharedDrawStore:
+    def __init__(self, data: DrawStore) -> None:
+        self._blocks: list[SharedMemory] = []
+        self.spec: list[_ArraySpec] = []
+
+        for name in _STORE_FIELDS:
+            array = getattr(data, name)
+            block = SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+
+            self._blocks.append(block)
+            self.spec.append((name, block.name, array.shape, array.dtype.str))
+
+    def __enter__(self) -> 'SharedDrawStore':
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+
+        self._blocks = []
+
+    @staticmethod
+    def attach(spec: list[_ArraySpec]) -> tuple[DrawStore, list[SharedMemory]]:
+        blocks = []
+        arrays = {}
+
+        for name, block_name, shape, dtype in spec:
+            block = SharedMemory(name=block_name)
+            blocks.append(block)
+            arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+        return DrawStore(**arrays), blocks
+
+
+class BacktestPool:
+    def __init__(self, data: DrawStore, workers: int | None = None) -> None:
+        self._data = data
+        self._workers = workers or os.cpu_count() or 1
+
+    def results_gen(self, tasks: Sequence[BacktestTask]) -> Iterator[tuple[int, dict[GameType, BacktestReport]]]:
+        if self._workers == 1:
+            for i, task in enumerate(tasks):
+                yield i, run_backtest(task, self._data)
+            return
+
+        with (
+            SharedDrawStore(self._data) as shared,
+            ProcessPoolExecutor(self._workers, initializer=_init_worker, initargs=(shared.spec,)) as executor,
+        ):
+            futures = {executor.submit(_run_in_worker, task): i for i, task in enumerate(tasks)}
+
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+
+def run_backtest(task: BacktestTask, data: DrawStore) -> dict[GameType, BacktestReport]:
+    strategy = StrategyRegistry.resolve(task.strategy_name, task.params)
+    strategy.seed(task.seed)
+    engine = BacktestEngine(strategy, keep_history=False)
+
+    if strategy.supports_batch:
+        calculator = MetricsCalculator.from_batches(engine.score_batch(data))
+    else:
+        calculator = MetricsCalculator(engine.results_gen(data))
+
+    return {game_type: calculator.generate_report(game_type) for game_type in GameType}
+
+
+_worker_data: DrawStore | None = None
+_worker_blocks: list[SharedMemory] = []
+
+
+def _init_worker(spec: list[_ArraySpec]) -> None:
+    global _worker_data, _worker_blocks
+    _worker_data, _worker_blocks = SharedDrawStore.attach(spec)
+
+
+def _run_in_worker(task: BacktestTask) -> dict[GameType, BacktestReport]:
+    return run_backtest(task, _worker_data)
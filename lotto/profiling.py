@@ -0,0 +1,219 @@
+import json
+import math
+import time
+import tracemalloc
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+from functools import wraps
+from pathlib import Path
+from typing import TYPE_CHECKING, ParamSpec, TypeVar
+
+if TYPE_CHECKING:
+    import cProfile
+
+P = ParamSpec('P')
+R = TypeVar('R')
+T = TypeVar('T')
+
+STRATEGY_METHODS = (
+    'prepare_data',
+    'observe',
+    'generate_numbers',
+    'generate_batch',
+    'generate_tickets',
+    'generate_tickets_batch',
+)
+ENGINE_METHODS = ('_count_matches', '_score_game_type')
+METRICS_METHODS = ('update', 'update_batch')
+
+_DISABLED = nullcontext()
+
+
+@dataclass
+class PhaseTiming:
+    name: str
+    seconds: float
+    peak_bytes: int | None
+
+
+@dataclass
+class CallTiming:
+    name: str
+    count: int
+    total_seconds: float
+    p50_seconds: float
+    p99_seconds: float
+
+
+class Profiler:
+    def __init__(self) -> None:
+        self._enabled = False
+        self._mode: str | None = None
+        self._origin = 0
+        self._phases: list[tuple[str, int, int, int | None]] = []
+        self._calls: defaultdict[str, list[tuple[int, int]]] = defaultdict(list)
+        self._cprofile: cProfile.Profile | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @property
+    def mode(self) -> str | None:
+        return self._mode
+
+    def enable(self, mode: str | None = None) -> None:
+        self._enabled = True
+        self._mode = mode
+        self._origin = time.perf_counter_ns()
+        self._phases.clear()
+        self._calls.clear()
+
+        if mode == 'cprofile':
+            import cProfile
+
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        elif mode == 'tracemalloc':
+            tracemalloc.start()
+
+    def disable(self) -> None:
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        if self._mode == 'tracemalloc':
+            tracemalloc.stop()
+
+        self._enabled = False
+
+    def phase(self, name: str) -> AbstractContextManager[None]:
+        # a shared no-op context when profiling is off, so phases cost next to nothing
+        return self._phase(name) if self._enabled else _DISABLED
+
+    def instrument(self, obj: T, names: Iterable[str] = STRATEGY_METHODS) -> T:
+        if not self._enabled:
+            return obj
+
+        for name in names:
+            method = getattr(obj, name, None)
+
+            if method is not None:
+                setattr(obj, name, self._timed(f'{type(obj).__name__}.{name}', method))
+
+        return obj
+
+    def phases(self) -> list[PhaseTiming]:
+        return [PhaseTiming(name, (end - start) / 1e9, peak) for name, start, end, peak in self._phases]
+
+    def calls(self) -> list[CallTiming]:
+        timings = []
+
+        for name, calls in self._calls.items():
+            if not calls:
+                continue
+
+            durations = sorted(duration for _, duration in calls)
+            timings.append(
+                CallTiming(
+                    name=name,
+                    count=len(durations),
+                    total_seconds=sum(durations) / 1e9,
+                    p50_seconds=_percentile(durations, 0.50) / 1e9,
+                    p99_seconds=_percentile(durations, 0.99) / 1e9,
+                )
+            )
+
+        return sorted(timings, key=lambda timing: timing.total_seconds, reverse=True)
+
+    def top_functions(self, limit: int = 15) -> str:
+        if self._cprofile is None:
+            return ''
+
+        import io
+        import pstats
+
+        stream = io.StringIO()
+        pstats.Stats(self._cprofile, stream=stream).sort_stats('cumulative').print_stats(limit)
+        return stream.getvalue()
+
+    def export(self, path: Path) -> None:
+        if path.suffix == '.prof' and self._cprofile is not None:
+            self._cprofile.dump_stats(path)
+            return
+
+        if path.name.endswith('.trace.json'):
+            content = {'traceEvents': self._trace_events(), 'displayTimeUnit': 'ms'}
+        else:
+            content = {
+                'phases': [asdict(phase) for phase in self.phases()],
+                'calls': [asdict(call) for call in self.calls()],
+            }
+
+        path.write_text(json.dumps(content, indent=2), encoding='utf-8')
+
+    @contextmanager
+    def _phase(self, name: str) -> Iterator[None]:
+        tracing = tracemalloc.is_tracing()
+
+        if tracing:
+            tracemalloc.reset_peak()
+
+        start = time.perf_counter_ns()
+
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            peak = tracemalloc.get_traced_memory()[1] if tracing else None
+            self._phases.append((name, start, end, peak))
+
+    def _timed(self, name: str, method: Callable[P, R]) -> Callable[P, R]:
+        calls = self._calls[name]
+
+        @wraps(method)
+        def timed(*args: P.args, **kwargs: P.kwargs) -> R:
+            start = time.perf_counter_ns()
+            result = method(*args, **kwargs)
+            calls.append((start, time.perf_counter_ns() - start))
+            return result
+
+        return timed
+
+    def _trace_events(self) -> list[dict[str, object]]:
+        # Chrome trace format: complete events in microseconds, phases and calls on separate rows
+        events: list[dict[str, object]] = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': 0, 'tid': tid, 'args': {'name': label}}
+            for tid, label in ((0, 'phases'), (1, 'calls'))
+        ]
+
+        for name, start, end, _ in self._phases:
+            events.append(self._trace_event(name, 'phase', 0, start, end - start))
+
+        for name, calls in self._calls.items():
+            for start, duration in calls:
+                events.append(self._trace_event(name, 'call', 1, start, duration))
+
+        return events
+
+    def _trace_event(self, name: str, category: str, tid: int, start: int, duration: int) -> dict[str, object]:
+        return {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'pid': 0,
+            'tid': tid,
+            'ts': (start - self._origin) / 1e3,
+            'dur': duration / 1e3,
+        }
+
+
+def _percentile(sorted_values: list[int], q: float) -> float:
+    if not sorted_values:
+        return 0
+
+    # nearest-rank percentile
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+
+profiler = Profiler()
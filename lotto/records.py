@@ -0,0 +1,143 @@
+from datetime import date
+from pathlib import Path
+from types import TracebackType
+from typing import TYPE_CHECKING, BinaryIO
+
+import numpy as np
+
+from .core import AbstractStrategy, GameBatch, GameRecord, GameType
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+RECORD_DTYPE = np.dtype(
+    [
+        ('game_type', np.uint8),
+        ('draw_date', np.int32),
+        ('draw_result', np.uint8, (AbstractStrategy.TAKE,)),
+        ('generated_numbers', np.uint8, (AbstractStrategy.TAKE,)),
+        ('matches', np.uint8),
+    ]
+)
+CHUNK_SIZE = 65536
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_NO_DRAW = (0,) * AbstractStrategy.TAKE
+
+
+class RecordWriter:
+    def __init__(self, path: Path, chunk_size: int = CHUNK_SIZE) -> None:
+        self._path = path
+        self._chunk = np.zeros(chunk_size, dtype=RECORD_DTYPE)
+        self._size = 0
+        self._written = 0
+        self._parquet: pq.ParquetWriter | None = None
+        self._file: BinaryIO | None = None
+
+        if path.suffix == '.parquet':
+            from pyarrow.parquet import ParquetWriter
+
+            self._parquet = ParquetWriter(path, _parquet_schema())
+        else:
+            self._file = path.open('wb')
+
+    def __enter__(self) -> 'RecordWriter':
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None
+    ) -> None:
+        self.close()
+
+    @property
+    def written(self) -> int:
+        return self._written + self._size
+
+    def write(self, record: GameRecord) -> None:
+        self._chunk[self._size] = (
+            record.game_type.value,
+            record.draw_date.toordinal() - _EPOCH_ORDINAL,
+            record.draw_result or _NO_DRAW,
+            record.generated_numbers,
+            record.matches,
+        )
+        self._size += 1
+
+        if self._size == len(self._chunk):
+            self.flush()
+
+    def write_batch(self, batch: GameBatch) -> None:
+        generated_numbers = batch.generated_numbers.reshape(len(batch.matches), -1, AbstractStrategy.TAKE)
+        tickets = generated_numbers.shape[1]
+
+        # a portfolio is written one row per ticket, each repeating the draw it was played on
+        rows = np.zeros(batch.matches.size, dtype=RECORD_DTYPE)
+        rows['game_type'] = batch.game_type.value
+        rows['draw_date'] = np.repeat(batch.draw_dates.astype('datetime64[D]').astype(np.int32), tickets)
+        rows['draw_result'] = np.repeat(batch.draw_results, tickets, axis=0)
+        rows['generated_numbers'] = generated_numbers.reshape(-1, AbstractStrategy.TAKE)
+        rows['matches'] = batch.matches.ravel()
+
+        self.flush()
+        self._write_rows(rows)
+
+    def flush(self) -> None:
+        if self._size:
+            self._write_rows(self._chunk[: self._size])
+            self._size = 0
+
+    def close(self) -> None:
+        self.flush()
+
+        if self._parquet is not None:
+            self._parquet.close()
+        if self._file is not None:
+            self._file.close()
+
+    def _write_rows(self, rows: np.ndarray) -> None:
+        self._written += len(rows)
+
+        if self._file is not None:
+            rows.tofile(self._file)
+            return
+
+        import pyarrow as pa
+
+        table = pa.table(
+            {
+                'game_type': pa.array([GameType(value).name for value in rows['game_type'].tolist()]),
+                'draw_date': pa.array(rows['draw_date']).cast(pa.date32()),
+                'draw_result': _fixed_size_list(rows['draw_result']),
+                'generated_numbers': _fixed_size_list(rows['generated_numbers']),
+                'matches': pa.array(rows['matches']),
+            },
+            schema=self._parquet.schema,
+        )
+        self._parquet.write_table(table)
+
+
+def read_records(path: Path) -> np.ndarray:
+    return np.fromfile(path, dtype=RECORD_DTYPE)
+
+
+def _parquet_schema() -> 'pa.Schema':
+    import pyarrow as pa
+
+    numbers = pa.list_(pa.uint8(), AbstractStrategy.TAKE)
+
+    return pa.schema(
+        [
+            ('game_type', pa.string()),
+            ('draw_date', pa.date32()),
+            ('draw_result', numbers),
+            ('generated_numbers', numbers),
+            ('matches', pa.uint8()),
+        ]
+    )
+
+
+def _fixed_size_list(numbers: np.ndarray) -> 'pa.FixedSizeListArray':
+    import pyarrow as pa
+
+    return pa.FixedSizeListArray.from_arrays(pa.array(np.ascontiguousarray(numbers).ravel()), AbstractStrategy.TAKE)
@@ -0,0 +1,143 @@
+import importlib
+import json
+import os
+import pkgutil
+import site
+import sys
+from dataclasses import dataclass
+from importlib import metadata
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .core import AbstractStrategy
+
+ENTRY_POINT_GROUP = 'lotto.strategies'
+BUILTIN_PACKAGE = 'lotto.strategies'
+# beside the default draw cache - config.yaml is not read here, listing strategies must not pay for yaml
+MANIFEST_PATH = Path('~/.cache/lotto/strategies.json').expanduser()
+
+
+@dataclass
+class StrategyMetadata:
+    requires_data: bool = True
+    has_params: bool = True
+    # attributes set by prepare_data, naming them lets the prepared state be cached on disk
+    state: tuple[str, ...] = ()
+
+
+class StrategyRegistry:
+    _registry: dict[str, tuple[type['AbstractStrategy'], StrategyMetadata]] = {}
+    _manifest: dict[str, str] = {}
+
+    @classmethod
+    def register(cls, name: str, metadata: StrategyMetadata | None = None) -> callable:
+        def wrapper(strategy_type: type['AbstractStrategy']) -> type['AbstractStrategy']:
+            cls._registry[name] = strategy_type, metadata or StrategyMetadata()
+            return strategy_type
+
+        return wrapper
+
+    @classmethod
+    def add_manifest(cls, manifest: dict[str, str]) -> None:
+        cls._manifest.update(manifest)
+
+    @classmethod
+    def discover(cls, manifest_path: Path | None = MANIFEST_PATH) -> None:
+        signature = _discovery_signature()
+        manifest = _read_manifest(manifest_path, signature) if manifest_path else None
+
+        if manifest is None:
+            manifest = cls._scan()
+
+            if manifest_path:
+                _write_manifest(manifest_path, signature, manifest)
+
+        cls.add_manifest(manifest)
+
+    @classmethod
+    def requires_data(cls, name: str) -> bool:
+        _, metadata = cls._get(name)
+        return metadata.requires_data
+
+    @classmethod
+    def state(cls, name: str) -> tuple[str, ...]:
+        _, metadata = cls._get(name)
+        return metadata.state
+
+    @classmethod
+    def list_strategies(cls) -> list[str]:
+        return list(dict.fromkeys([*cls._manifest, *cls._registry]))
+
+    @classmethod
+    def resolve(cls, name: str, params: dict[str, str]) -> 'AbstractStrategy':
+        strategy_type, metadata = cls._get(name)
+        return strategy_type(params) if metadata.has_params else strategy_type()
+
+    @classmethod
+    def _scan(cls) -> dict[str, str]:
+        # built-in modules have to be imported to learn what they register, plugins name it in their entry point
+        package = importlib.import_module(BUILTIN_PACKAGE)
+
+        for module in pkgutil.walk_packages(package.__path__, f'{BUILTIN_PACKAGE}.'):
+            importlib.import_module(module.name)
+
+        manifest = {name: strategy_type.__module__ for name, (strategy_type, _) in cls._registry.items()}
+
+        for entry_point in metadata.entry_points(group=ENTRY_POINT_GROUP):
+            manifest.setdefault(entry_point.name, entry_point.module)
+
+        return manifest
+
+    @classmethod
+    def _get(cls, name: str) -> tuple[type['AbstractStrategy'], StrategyMetadata]:
+        if name not in cls._registry and name in cls._manifest:
+            importlib.import_module(cls._manifest[name])
+
+        return cls._registry.get(name)
+
+
+def _discovery_signature() -> list[list[str | int]]:
+    # stats that change whenever a built-in strategy is edited or a distribution is installed or removed
+    if getattr(sys, 'frozen', False):
+        paths = [sys.executable]
+    else:
+        package_dir = Path(__file__).parent / BUILTIN_PACKAGE.rpartition('.')[2]
+        paths = sorted(str(path) for path in package_dir.rglob('*.py'))
+
+    paths += [path for path in [*site.getsitepackages(), site.getusersitepackages()] if path in sys.path]
+    signature = []
+
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+
+        signature.append([path, stat.st_mtime_ns, stat.st_size])
+
+    return signature
+
+
+def _read_manifest(path: Path, signature: list[list[str | int]]) -> dict[str, str] | None:
+    try:
+        cached = json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(cached, dict) or cached.get('signature') != signature:
+        return None
+
+    return cached.get('strategies')
+
+
+def _write_manifest(path: Path, signature: list[list[str | int]], manifest: dict[str, str]) -> None:
+    partial = path.with_suffix(f'.{os.getpid()}.partial')
+
+    # a read-only home only costs a rescan on the next start
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial.write_text(json.dumps({'signature': signature, 'strategies': manifest}), encoding='utf-8')
+        os.replace(partial, path)
+    except OSError:
+        partial.unlink(missing_ok=True)
@@ -0,0 +1,279 @@
+import asyncio
+import contextlib
+import json
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+
+from .cache import StateCache
+from .core import AbstractStrategy, DrawStore
+from .registry import StrategyRegistry
+
+CACHE_SIZE = 32
+REFRESH_INTERVAL = 300
+MAX_TICKETS = 10_000
+
+_RESERVED_QUERY = ('strategy', 'tickets')
+
+_StrategyKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+@dataclass
+class _Prepared:
+    strategy: AbstractStrategy
+    version: str | None
+
+
+class ServerError(Exception):
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class PreparedCache:
+    def __init__(self, maxsize: int = CACHE_SIZE) -> None:
+        self._maxsize = maxsize
+        self._entries: OrderedDict[_StrategyKey, _Prepared] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: _StrategyKey, version: str | None, prepare: Callable[[], AbstractStrategy]) -> AbstractStrategy:
+        entry = self._entries.get(key)
+
+        if entry is None or entry.version != version:
+            entry = self._entries[key] = _Prepared(prepare(), version)
+
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+        return entry.strategy
+
+    def advance(self, old: DrawStore, new: DrawStore, version: str) -> None:
+        # history only grew: incremental strategies catch up on the new draws, the rest re-prepare on next use
+        appended = len(new) >= len(old) and (not len(old) or new.draw_dates[len(old) - 1] == old.draw_dates[-1])
+
+        for key, entry in list(self._entries.items()):
+            if entry.version is None:
+                continue
+
+            if appended and entry.strategy.is_incremental:
+                for i in range(len(old), len(new)):
+                    entry.strategy.observe(new.record(i))
+                entry.version = version
+            else:
+                del self._entries[key]
+
+
+class TicketServer:
+    def __init__(
+        self,
+        load: Callable[[], DrawStore],
+        data: DrawStore,
+        refresh_interval: float = REFRESH_INTERVAL,
+        cache_size: int = CACHE_SIZE,
+        state_cache: StateCache | None = None,
+    ) -> None:
+        self._load = load
+        self._data = data
+        self._version = _data_version(data)
+        self._refresh_interval = refresh_interval
+        self._prepared = PreparedCache(cache_size)
+        self._state_cache = state_cache
+        self._pending: dict[_StrategyKey, list[tuple[int, asyncio.Future[list[list[int]]]]]] = {}
+
+    @property
+    def version(self) -> str:
+        return self._version
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8000, socket: str | None = None) -> None:
+        if socket:
+            server = await asyncio.start_unix_server(self._handle, socket)
+        else:
+            server = await asyncio.start_server(self._handle, host, port)
+
+        refresh = asyncio.create_task(self._refresh_forever())
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            refresh.cancel()
+
+    async def generate(self, strategy_name: str, params: dict[str, str], tickets: int = 1) -> list[list[int]]:
+        if strategy_name not in StrategyRegistry.list_strategies():
+            raise ServerError(HTTPStatus.NOT_FOUND, f'Unknown strategy "{strategy_name}"')
+
+        if not 1 <= tickets <= MAX_TICKETS:
+            raise ServerError(HTTPStatus.BAD_REQUEST, f'tickets must be between 1 and {MAX_TICKETS}')
+
+        key = strategy_name, tuple(sorted(params.items()))
+        future = asyncio.get_running_loop().create_future()
+        pending = self._pending.setdefault(key, [])
+
+        # requests for the same strategy that arrive within one loop iteration share a single strategy lookup
+        if not pending:
+            asyncio.get_running_loop().call_soon(self._flush, key)
+
+        pending.append((tickets, future))
+        return await future
+
+    async def refresh(self) -> bool:
+        data = await asyncio.to_thread(self._load)
+        version = _data_version(data)
+
+        if version == self._version:
+            return False
+
+        self._prepared.advance(self._data, data, version)
+        self._data, self._version = data, version
+        return True
+
+    def status(self) -> dict[str, object]:
+        return {
+            'version': self._version,
+            'draws': len(self._data),
+            'prepared': len(self._prepared),
+        }
+
+    def _flush(self, key: _StrategyKey) -> None:
+        pending = self._pending.pop(key)
+
+        try:
+            strategy = self._strategy(key)
+        except Exception as e:
+            for _, future in pending:
+                future.set_exception(_as_server_error(e))
+            return
+
+        # each request gets its own set, since wheels and deterministic strategies
+        # design the k tickets together rather than drawing them independently
+        for count, future in pending:
+            try:
+                if count > 1 and not strategy.supports_tickets:
+                    raise ServerError(HTTPStatus.BAD_REQUEST, f'{key[0]} plays one ticket per draw, tickets must be 1')
+
+                future.set_result(strategy.generate_tickets(count))
+            except Exception as e:
+                future.set_exception(_as_server_error(e))
+
+    def _strategy(self, key: _StrategyKey) -> AbstractStrategy:
+        strategy_name, params = key
+        requires_data = StrategyRegistry.requires_data(strategy_name)
+
+        def prepare() -> AbstractStrategy:
+            strategy = StrategyRegistry.resolve(strategy_name, dict(params))
+            data = self._data if requires_data else DrawStore.empty()
+
+            if self._state_cache is None:
+                strategy.prepare_data(data)
+            else:
+                self._state_cache.prepare(strategy, strategy_name, dict(params), data)
+
+            return strategy
+
+        # strategies that ignore the history stay warm across refreshes
+        return self._prepared.get(key, self._version if requires_data else None, prepare)
+
+    async def _refresh_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self._refresh_interval)
+
+            # keep serving the data we have if the refresh fails, the next one tries again
+            with contextlib.suppress(Exception):
+                await self.refresh()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while request := await _read_request(reader):
+                method, target, keep_alive = request
+                status, body = await self._dispatch(method, target)
+
+                writer.write(_build_response(status, body, keep_alive))
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            # dropped connections and malformed requests just close the socket
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: str, target: str) -> tuple[HTTPStatus, dict[str, object]]:
+        url = urlsplit(target)
+
+        if method != 'GET':
+            return HTTPStatus.METHOD_NOT_ALLOWED, {'error': f'{method} is not supported'}
+
+        if url.path == '/health':
+            return HTTPStatus.OK, self.status()
+
+        if url.path != '/generate':
+            return HTTPStatus.NOT_FOUND, {'error': f'No route for {url.path}'}
+
+        query = dict(parse_qsl(url.query))
+        params = {name: value for name, value in query.items() if name not in _RESERVED_QUERY}
+
+        try:
+            if 'strategy' not in query:
+                raise ServerError(HTTPStatus.BAD_REQUEST, 'Missing strategy')
+
+            tickets = await self.generate(query['strategy'], params, int(query.get('tickets', 1)))
+        except ServerError as e:
+            return e.status, {'error': str(e)}
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, {'error': 'tickets must be an integer'}
+
+        return HTTPStatus.OK, {'strategy': query['strategy'], 'version': self._version, 'tickets': tickets}
+
+
+async def _read_request(reader: asyncio.StreamReader) -> tuple[str, str, bool] | None:
+    request_line = await reader.readline()
+
+    if not request_line.strip():
+        return None
+
+    headers = {}
+
+    while (line := await reader.readline()).strip():
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip().lower()
+
+    # bodies are never used, but must be drained to keep the connection in sync
+    if length := int(headers.get('content-length', 0)):
+        await reader.readexactly(length)
+
+    method, target, version = request_line.decode('latin-1').split()
+    keep_alive = headers.get('connection', 'keep-alive' if version == 'HTTP/1.1' else 'close') == 'keep-alive'
+
+    return method, target, keep_alive
+
+
+def _build_response(status: HTTPStatus, body: dict[str, object], keep_alive: bool) -> bytes:
+    payload = json.dumps(body, separators=(',', ':')).encode()
+    head = (
+        f'HTTP/1.1 {status.value} {status.phrase}\r\n'
+        'Content-Type: application/json\r\n'
+        f'Content-Length: {len(payload)}\r\n'
+        f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n'
+    )
+
+    return head.encode() + payload
+
+
+def _as_server_error(error: Exception) -> ServerError:
+    return error if isinstance(error, ServerError) else ServerError(HTTPStatus.BAD_REQUEST, str(error))
+
+
+def _data_version(data: DrawStore) -> str:
+    if not len(data):
+        return ''
+
+    return f'{np.datetime_as_string(data.draw_dates[-1], unit="D")}/{len(data)}'
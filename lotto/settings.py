@@ -1,8 +1,7 @@
 import os
 import sys
 from dataclasses import dataclass, field, fields
-
-import yaml
+from functools import cache
 
 CONFIG_PATH = 'config.yaml'
 
@@ -18,15 +17,28 @@ class ApiConfig:
     base_url: str = ''
     api_key: str = ''
     timeout: int = 30
+    retries: int = 3
+    backoff_factor: float = 0.5
+    workers: int = 4
+
+
+@dataclass
+class CacheConfig:
+    dir: str = '~/.cache/lotto'
+    ttl: int = 3600
+    state_max_mb: int = 64
 
 
 @dataclass
 class Config:
     app: AppConfig = field(default_factory=AppConfig)
     api: ApiConfig = field(default_factory=ApiConfig)
+    cache: CacheConfig = field(default_factory=CacheConfig)
 
 
 def load_config(filename: str = CONFIG_PATH) -> Config:
+    import yaml
+
     if os.path.exists(filename):
         with open(filename, encoding='utf-8') as f:
             d = yaml.safe_load(f)
@@ -47,4 +59,6 @@ def load_config(filename: str = CONFIG_PATH) -> Config:
     return c
 
 
-config = load_config()
+@cache
+def get_config() -> Config:
+    return load_config()
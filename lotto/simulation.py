@@ -1,35 +1,203 @@
 import datetime
+import math
 from collections.abc import Iterator
+from dataclasses import dataclass
+from statistics import NormalDist
 
-from .core import AbstractStrategy, GameRecord, GameType, LottoDrawRecord
+import numpy as np
+
+from .analytic import AnalyticEvaluator
+from .core import (
+    AbstractStrategy,
+    DrawStore,
+    GameBatch,
+    GameRecord,
+    GameType,
+    LottoDrawRecord,
+    count_matches,
+    encode_masks,
+)
+from .metrics import MetricsCalculator
+
+
+@dataclass(frozen=True)
+class WalkSchedule:
+    # 0 prepares once at the start of the scored range, a plain train/test split
+    refit_every: int = 1
+    # 0 trains on the whole history before each refit
+    window: int = 0
+    # leading draws used only for training, never scored
+    warmup: int = 0
+    stop_confidence: float | None = None
+    min_draws: int = 500
+
+    @property
+    def refits_every_draw(self) -> bool:
+        return self.refit_every == 1 and not self.window
+
+    def refit_due(self, cursor: int) -> bool:
+        since_warmup = cursor - self.warmup
+        return since_warmup == 0 or (self.refit_every > 0 and since_warmup % self.refit_every == 0)
 
 
 class BacktestEngine:
-    def __init__(self, strategy: AbstractStrategy) -> None:
+    def __init__(
+        self,
+        strategy: AbstractStrategy,
+        incremental: bool = True,
+        batch: bool = True,
+        keep_history: bool = True,
+        schedule: WalkSchedule | None = None,
+    ) -> None:
         self._history: list[GameRecord] = []
         self._strategy = strategy
+        self._incremental = incremental
+        self._batch = batch
+        self._keep_history = keep_history
+        self._schedule = schedule or WalkSchedule()
+        self._scored = slice(0, 0)
+        self._stopped_early = False
 
     @property
     def history(self) -> list[GameRecord]:
         return self._history
 
-    def run(self, data: list[LottoDrawRecord]) -> list[GameRecord]:
+    @property
+    def scored(self) -> slice:
+        return self._scored
+
+    @property
+    def stopped_early(self) -> bool:
+        return self._stopped_early
+
+    def run(self, data: DrawStore | list[LottoDrawRecord]) -> list[GameRecord]:
         return list(self.results_gen(data))
 
-    def results_gen(self, data: list[LottoDrawRecord]) -> Iterator[GameRecord]:
+    def results_gen(self, data: DrawStore | list[LottoDrawRecord]) -> Iterator[GameRecord]:
         self._history = []
+        data = self._as_store(data)
+        schedule = self._schedule
+        bounds = _RoiBounds(schedule.stop_confidence, schedule.min_draws) if schedule.stop_confidence else None
+
+        self._scored = slice(schedule.warmup, schedule.warmup)
+        self._stopped_early = False
+
+        if self._batch and self._strategy.supports_batch and schedule.refits_every_draw:
+            draws = self._batch_draws_gen(data, schedule.warmup)
+        else:
+            draws = self._walk_draws_gen(data)
+
+        for cursor, records in draws:
+            yield from records
+            self._scored = slice(schedule.warmup, cursor + 1)
+
+            if bounds is not None and bounds.add(records):
+                self._stopped_early = True
+                return
+
+    def score_batch(self, data: DrawStore | list[LottoDrawRecord]) -> list[GameBatch]:
+        data = self._as_store(data)
+        return [self._score_game_type(data, game_type) for game_type in GameType]
+
+    def score_portfolio(self, data: DrawStore | list[LottoDrawRecord], tickets: int) -> list[GameBatch]:
+        data = self._as_store(data)
+
+        if self._batch and self._strategy.supports_tickets_batch(tickets):
+            portfolios = {
+                game_type: np.asarray(self._strategy.generate_tickets_batch(data, tickets), dtype=np.uint8)
+                for game_type in GameType
+            }
+        else:
+            portfolios = {
+                game_type: np.zeros((len(data), tickets, AbstractStrategy.TAKE), np.uint8) for game_type in GameType
+            }
+
+            for cursor, _ in self._walk(data, WalkSchedule()):
+                for game_type in GameType:
+                    portfolios[game_type][cursor] = self._strategy.generate_tickets(tickets)
+
+        return [
+            GameBatch(
+                game_type=game_type,
+                draw_dates=data.draw_dates,
+                draw_results=data.numbers(game_type),
+                generated_numbers=portfolio,
+                matches=count_matches(data.masks(game_type)[:, None], encode_masks(portfolio)),
+            )
+            for game_type, portfolio in portfolios.items()
+        ]
+
+    def _walk(self, data: DrawStore, schedule: WalkSchedule) -> Iterator[tuple[int, LottoDrawRecord]]:
+        # observing every draw only matches the schedule when it refits on the whole history each draw
+        incremental = self._incremental and self._strategy.is_incremental and schedule.refits_every_draw
+
+        if incremental:
+            self._strategy.prepare_data(data[: schedule.warmup])
+
+        for cursor in range(schedule.warmup, len(data)):
+            record = data.record(cursor)
+
+            if not incremental and schedule.refit_due(cursor):
+                start = max(cursor - schedule.window, 0) if schedule.window else 0
+                self._strategy.prepare_data(data[start:cursor])
 
-        for record in data:
-            data_chunk = data[: data.index(record)]
-            self._strategy.prepare_data(data_chunk)
+            yield cursor, record
 
+            if incremental:
+                self._strategy.observe(record)
+
+    def _walk_draws_gen(self, data: DrawStore) -> Iterator[tuple[int, list[GameRecord]]]:
+        for cursor, record in self._walk(data, self._schedule):
             datasets = [
                 (GameType.LOTTO, record.lotto_numbers),
                 (GameType.LOTTO_PLUS, record.plus_numbers),
             ]
 
-            for game_type, draw_result in datasets:
-                yield self._handle_game(record.draw_date, game_type, draw_result)
+            yield cursor, [self._handle_game(record.draw_date, game_type, result) for game_type, result in datasets]
+
+    def _batch_draws_gen(self, data: DrawStore, start: int) -> Iterator[tuple[int, list[GameRecord]]]:
+        batches = [
+            (
+                batch,
+                batch.draw_results.tolist(),
+                batch.generated_numbers.tolist(),
+                batch.matches.tolist(),
+                data.masks(batch.game_type) != 0,
+            )
+            for batch in self.score_batch(data)
+        ]
+
+        for cursor in range(start, len(data)):
+            draw_date = data.draw_dates[cursor].item()
+            records = []
+
+            for batch, draw_results, generated_numbers, matches, has_draw in batches:
+                new_record = GameRecord(
+                    game_type=batch.game_type,
+                    draw_date=draw_date,
+                    draw_result=draw_results[cursor] if has_draw[cursor] else [],
+                    generated_numbers=generated_numbers[cursor],
+                    matches=matches[cursor],
+                )
+
+                if self._keep_history:
+                    self._history.append(new_record)
+
+                records.append(new_record)
+
+            yield cursor, records
+
+    def _score_game_type(self, data: DrawStore, game_type: GameType) -> GameBatch:
+        generated_numbers = np.asarray(self._strategy.generate_batch(data), dtype=np.uint8)
+        matches = count_matches(data.masks(game_type), encode_masks(generated_numbers))
+
+        return GameBatch(
+            game_type=game_type,
+            draw_dates=data.draw_dates,
+            draw_results=data.numbers(game_type),
+            generated_numbers=generated_numbers,
+            matches=matches,
+        )
 
     def _handle_game(self, draw_date: datetime.date, game_type: GameType, draw_result: list[int]) -> GameRecord:
         generated_numbers = self._strategy.generate_numbers()
@@ -43,8 +211,50 @@ class BacktestEngine:
             matches=matches,
         )
 
-        self._history.append(new_record)
+        if self._keep_history:
+            self._history.append(new_record)
+
         return new_record
 
     def _count_matches(self, draw_result: list[int], generated_numbers: list[int]) -> int:
         return len(set(draw_result) & set(generated_numbers))
+
+    @staticmethod
+    def _as_store(data: DrawStore | list[LottoDrawRecord]) -> DrawStore:
+        return data if isinstance(data, DrawStore) else DrawStore.from_records(data)
+
+
+class _RoiBounds:
+    def __init__(self, confidence: float, min_draws: int) -> None:
+        self._z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        self._min_draws = min_draws
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._floor = 0.0
+        # no ticket changes the match odds against a fair draw, so its prize variance is at least a random ticket's
+        evaluator = AnalyticEvaluator()
+        self._prize_variance = {
+            game_type: evaluator.calculate_monetary_metrics(game_type, 1).variance_of_returns for game_type in GameType
+        }
+
+    def add(self, records: list[GameRecord]) -> bool:
+        cost = sum(MetricsCalculator.TICKET_COSTS[r.game_type] for r in records)
+        winnings = sum(MetricsCalculator.PRIZE_TABLES[r.game_type].get(r.matches, 0) for r in records)
+        roi = (winnings - cost) / cost
+
+        self._count += 1
+        delta = roi - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (roi - self._mean)
+        self._floor += (sum(self._prize_variance[r.game_type] for r in records) / cost**2 - self._floor) / self._count
+
+        if self._count < max(self._min_draws, 2):
+            return False
+
+        # the jackpot rarely shows up early, so the sample variance alone would decide the sign far too soon
+        variance = max(self._m2 / (self._count - 1), self._floor)
+
+        # decided once the confidence interval of the per-draw ROI no longer straddles break-even
+        margin = self._z * math.sqrt(variance / self._count)
+        return self._mean + margin < 0 or self._mean - margin > 0
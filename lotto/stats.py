@@ -0,0 +1,86 @@
+import math
+from collections.abc import Sequence
+
+import numpy as np
+
+_EPSILON = 1e-15
+_TINY = 1e-300
+_MAX_ITERATIONS = 10_000
+
+
+def chi_square(observed: Sequence[float], expected: Sequence[float] | None = None) -> tuple[float, float]:
+    observed = np.asarray(observed, dtype=np.float64)
+    expected = np.full_like(observed, observed.mean()) if expected is None else np.asarray(expected, dtype=np.float64)
+
+    statistic = float(((observed - expected) ** 2 / expected).sum())
+    return statistic, chi2_sf(statistic, len(observed) - 1)
+
+
+def chi2_sf(x: float, df: int) -> float:
+    if x <= 0:
+        return 1.0
+
+    return regularized_gamma_q(df / 2, x / 2)
+
+
+def regularized_gamma_q(a: float, x: float) -> float:
+    if x < 0 or a <= 0:
+        raise ValueError(f'Invalid arguments for the incomplete gamma function: a={a}, x={x}')
+    if x == 0:
+        return 1.0
+
+    if x < a + 1:
+        return 1.0 - _gamma_p_series(a, x)
+    return _gamma_q_continued_fraction(a, x)
+
+
+def entropy(frequency: Sequence[float]) -> float:
+    frequency = np.asarray(frequency, dtype=np.float64)
+    total = frequency.sum()
+
+    if total == 0:
+        return 0
+
+    probabilities = frequency[frequency > 0] / total
+    return float(-(probabilities * np.log2(probabilities)).sum())
+
+
+def _gamma_p_series(a: float, x: float) -> float:
+    term = total = 1.0 / a
+    denominator = a
+
+    for _ in range(_MAX_ITERATIONS):
+        denominator += 1
+        term *= x / denominator
+        total += term
+
+        if abs(term) < abs(total) * _EPSILON:
+            break
+
+    return total * math.exp(-x + a * math.log(x) - math.lgamma(a))
+
+
+def _gamma_q_continued_fraction(a: float, x: float) -> float:
+    # modified Lentz's method
+    b = x + 1 - a
+    c = 1 / _TINY
+    d = 1 / b
+    h = d
+
+    for i in range(1, _MAX_ITERATIONS):
+        an = -i * (i - a)
+        b += 2
+
+        d = an * d + b
+        d = _TINY if abs(d) < _TINY else d
+        c = b + an / c
+        c = _TINY if abs(c) < _TINY else c
+
+        d = 1 / d
+        delta = d * c
+        h *= delta
+
+        if abs(delta - 1) < _EPSILON:
+            break
+
+    return math.exp(-x + a * math.log(x) - math.lgamma(a)) * h
@@ -1,6 +1,9 @@
 import random
 
-from ..core import AbstractStrategy, LottoDrawRecord, StrategyMetadata, StrategyRegistry
+import numpy as np
+
+from ..core import AbstractStrategy, DrawStore, LottoDrawRecord, Seed, sample_tickets
+from ..registry import StrategyMetadata, StrategyRegistry
 
 _metadata = StrategyMetadata(
     requires_data=False,
@@ -10,10 +13,30 @@ _metadata = StrategyMetadata(
 
 @StrategyRegistry.register('random', _metadata)
 class Baseline(AbstractStrategy):
-    def prepare_data(self, _: list[LottoDrawRecord]) -> None:
+    def __init__(self) -> None:
+        self.seed(None)
+
+    def seed(self, seed: Seed) -> None:
+        self._rng = np.random.default_rng(seed)
+        # single tickets come from a pure Python generator seeded off the same stream, numpy is slow one at a time
+        self._random = random.Random(int(self._rng.integers(2**63)))
+
+    def prepare_data(self, _: DrawStore) -> None:
+        pass
+
+    def observe(self, _: LottoDrawRecord) -> None:
         pass
 
     def generate_numbers(self) -> list[int]:
-        numbers = random.sample(range(1, self.POOL_MAX + 1), k=self.TAKE)
+        numbers = self._random.sample(range(1, self.POOL_MAX + 1), k=self.TAKE)
         numbers.sort()
         return numbers
+
+    def generate_batch(self, data: DrawStore) -> np.ndarray:
+        return sample_tickets(self._rng, len(data))
+
+    def generate_tickets(self, k: int) -> list[list[int]]:
+        return sample_tickets(self._rng, k).tolist()
+
+    def generate_tickets_batch(self, data: DrawStore, k: int) -> np.ndarray:
+        return sample_tickets(self._rng, (len(data), k))
@@ -1,33 +1,66 @@
-from collections import Counter
+from itertools import combinations, islice
 
-from ..core import AbstractStrategy, LottoDrawRecord, StrategyRegistry
+import numpy as np
+
+from ..core import AbstractStrategy, DrawStore, GameType, LottoDrawRecord, RollingFrequencyIndex
+from ..registry import StrategyMetadata, StrategyRegistry
 
 default_params: dict[str, str] = {
     'lookback': '100',
 }
 
 
-@StrategyRegistry.register('hot-numbers')
+_metadata = StrategyMetadata(
+    state=('_index',),
+)
+
+
+@StrategyRegistry.register('hot-numbers', _metadata)
 class HotNumbers(AbstractStrategy):
     def __init__(self, params: dict[str, str]) -> None:
         self._lookback = int(params.get('lookback', default_params['lookback']))
-        self._data: list[LottoDrawRecord] = []
+        self._index = RollingFrequencyIndex(self._lookback, self.POOL_MAX)
+        self._batch: tuple[DrawStore, np.ndarray] | None = None
+
+    def prepare_data(self, data: DrawStore) -> None:
+        counts = data.index.lookback_counts(self._lookback)
+        recent = data.lotto_numbers[-self._lookback :].tolist() if self._lookback else []
+        size = min(len(data), self._lookback) if self._lookback else len(data)
+        self._index = RollingFrequencyIndex.from_window(counts, size, recent, self._lookback, self.POOL_MAX)
 
-    def prepare_data(self, data: list[LottoDrawRecord]) -> None:
-        self._data = data
+    def observe(self, record: LottoDrawRecord) -> None:
+        self._index.push(record.lotto_numbers)
 
     def generate_numbers(self) -> list[int]:
-        draws = self._data[-self._lookback :] if self._lookback else self._data
-        counter = Counter()
+        pick = self._index.top(self.TAKE)
+        pick.sort()
 
-        for record in draws:
-            counter.update([n for n in record.lotto_numbers if 1 <= n <= self.POOL_MAX])
+        return pick
 
-        ranked = [n for n, _ in counter.most_common()]
-        pool = list(range(1, self.POOL_MAX + 1))
-        ranked += [n for n in pool if n not in ranked]
+    def generate_tickets(self, k: int) -> list[list[int]]:
+        # the hottest six first, then the next-ranked combinations, each swapping in colder numbers
+        tickets = [sorted(ticket) for ticket in islice(combinations(self._index.top(self.POOL_MAX), self.TAKE), k)]
 
-        pick = ranked[: self.TAKE]
-        pick.sort()
+        if len(tickets) < k:
+            raise ValueError(f'There are only {len(tickets)} distinct tickets')
 
-        return pick
+        return tickets
+
+    def generate_batch(self, data: DrawStore) -> np.ndarray:
+        # both games of a draw get the same pick, so reuse the ranking computed for the other game
+        if self._batch is None or self._batch[0] is not data:
+            self._batch = data, self._rank_walk_forward(data)
+
+        return self._batch[1]
+
+    def _rank_walk_forward(self, data: DrawStore) -> np.ndarray:
+        end = np.arange(len(data))
+        start = np.maximum(end - self._lookback, 0) if self._lookback else np.zeros_like(end)
+        counts = data.index.window_counts_batch(start, end, GameType.LOTTO)
+
+        # rank by count, ties go to the lower number - same order as RollingFrequencyIndex
+        scores = counts.astype(np.int64) * (self.POOL_MAX + 1) - np.arange(self.POOL_MAX)
+        numbers = np.argpartition(-scores, self.TAKE - 1, axis=1)[:, : self.TAKE] + 1
+        numbers.sort(axis=1)
+
+        return numbers.astype(np.uint8)
@@ -0,0 +1,111 @@
+from itertools import combinations
+
+import numpy as np
+
+from ..core import AbstractStrategy, DrawStore, LottoDrawRecord, Seed, encode_masks
+from ..registry import StrategyMetadata, StrategyRegistry
+
+default_params: dict[str, str] = {
+    'numbers': '',
+}
+
+_metadata = StrategyMetadata(
+    requires_data=False,
+    has_params=True,
+)
+
+_BITS = np.uint64(1) << np.arange(AbstractStrategy.POOL_MAX + 1, dtype=np.uint64)
+
+
+@StrategyRegistry.register('wheel', _metadata)
+class Wheel(AbstractStrategy):
+    def __init__(self, params: dict[str, str]) -> None:
+        numbers = params.get('numbers', default_params['numbers'])
+        self._pool = sorted({int(n) for n in numbers.split(',') if n}) or list(range(1, self.POOL_MAX + 1))
+        self._rng = np.random.default_rng()
+        self._wheels: dict[int, np.ndarray] = {}
+
+        if len(self._pool) < self.TAKE or not all(1 <= n <= self.POOL_MAX for n in self._pool):
+            raise ValueError(f'Wheel needs at least {self.TAKE} distinct numbers between 1 and {self.POOL_MAX}')
+
+    def seed(self, seed: Seed) -> None:
+        self._rng = np.random.default_rng(seed)
+        self._wheels = {}
+
+    def prepare_data(self, _: DrawStore) -> None:
+        pass
+
+    def observe(self, _: LottoDrawRecord) -> None:
+        pass
+
+    def generate_numbers(self) -> list[int]:
+        return self.generate_tickets(1)[0]
+
+    def generate_batch(self, data: DrawStore) -> np.ndarray:
+        return self.generate_tickets_batch(data, 1)[:, 0]
+
+    def generate_tickets(self, k: int) -> list[list[int]]:
+        return self._wheel(k).tolist()
+
+    def generate_tickets_batch(self, data: DrawStore, k: int) -> np.ndarray:
+        return np.broadcast_to(self._wheel(k), (len(data), k, self.TAKE))
+
+    def _wheel(self, k: int) -> np.ndarray:
+        if k not in self._wheels:
+            self._wheels[k] = cover_greedy(self._pool, k, self._rng)
+
+        return self._wheels[k]
+
+
+def cover_greedy(pool: list[int], k: int, rng: np.random.Generator) -> np.ndarray:
+    take = AbstractStrategy.TAKE
+    size = AbstractStrategy.POOL_MAX + 1
+    candidates = np.array(pool)
+    candidate_bits = _BITS[candidates - 1]
+    total_triples = len(pool) * (len(pool) - 1) * (len(pool) - 2) // 6
+
+    # pairs[a] has bit c - 1 set once a and c shared a ticket, triples[a, b] the same for a third number c
+    pairs = np.zeros(size, dtype=np.uint64)
+    triples = np.zeros((size, size), dtype=np.uint64)
+    covered_triples = 0
+    usage = np.zeros(len(pool), dtype=np.int64)
+    tickets = np.zeros((k, take), dtype=np.uint8)
+
+    for t in range(k):
+        chosen: list[int] = []
+        chosen_mask = np.uint64(0)
+
+        for _ in range(take):
+            new_pairs = np.bitwise_count(chosen_mask & ~pairs[candidates])
+            new_triples = np.zeros(len(pool), dtype=np.int64)
+
+            for a, b in combinations(chosen, 2):
+                new_triples += (~triples[a, b] & candidate_bits) != 0
+
+            score = new_pairs.astype(np.int64) + new_triples
+            score[(candidate_bits & chosen_mask) != 0] = -1
+
+            # most new pairs and triples first, then the least played number, then random
+            best = np.lexsort((rng.random(len(pool)), -usage, score))[-1]
+            chosen.append(int(candidates[best]))
+            chosen_mask |= candidate_bits[best]
+            usage[best] += 1
+
+        ticket = np.array(sorted(chosen))
+        ticket_bits = _BITS[ticket - 1]
+        ticket_mask = encode_masks(ticket)
+
+        for a, b in combinations(ticket.tolist(), 2):
+            covered_triples += take - 2 - int(np.bitwise_count(triples[a, b] & ticket_mask))
+            triples[a, b] = triples[b, a] = triples[a, b] | (ticket_mask & ~(_BITS[a - 1] | _BITS[b - 1]))
+
+        pairs[ticket] |= ticket_mask & ~ticket_bits
+        tickets[t] = ticket
+
+        # every triple of the pool is covered, start the next round of the wheel from scratch
+        if covered_triples >= total_triples * 3:
+            pairs[:] = 0
+            triples[:] = 0
+            covered_triples = 0
+
+    return tickets
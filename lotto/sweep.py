@@ -0,0 +1,83 @@
+import csv
+import itertools
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from .core import DrawStore, GameType, Seed, spawn_seeds
+from .metrics import BacktestReport
+from .parallel import BacktestPool, BacktestTask
+
+
+@dataclass
+class SweepResult:
+    params: dict[str, str]
+    reports: dict[GameType, BacktestReport]
+
+    @property
+    def roi_pct(self) -> float:
+        total_cost = sum(r.monetary_metrics.total_cost for r in self.reports.values())
+        net_profit = sum(r.monetary_metrics.net_profit for r in self.reports.values())
+        return (net_profit / total_cost) * 100 if total_cost > 0 else 0
+
+
+class ParameterSweep:
+    def __init__(
+        self,
+        strategy_name: str,
+        params: dict[str, str],
+        grid: dict[str, list[str]],
+        workers: int | None = None,
+        seed: Seed = None,
+    ) -> None:
+        combinations = [dict(zip(grid, values, strict=True)) for values in itertools.product(*grid.values())]
+        seeds = spawn_seeds(seed, len(combinations))
+
+        self._tasks = [
+            BacktestTask(strategy_name, params | combination, config_seed)
+            for combination, config_seed in zip(combinations, seeds, strict=True)
+        ]
+        self._workers = workers
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def results_gen(self, data: DrawStore) -> Iterator[SweepResult]:
+        pool = BacktestPool(data, self._workers)
+
+        for i, reports in pool.results_gen(self._tasks):
+            yield SweepResult(self._tasks[i].params, reports)
+
+    @staticmethod
+    def rank(results: Iterable[SweepResult]) -> list[SweepResult]:
+        return sorted(results, key=lambda r: r.roi_pct, reverse=True)
+
+    @staticmethod
+    def write(results: list[SweepResult], path: Path) -> None:
+        rows = [_to_row(result) for result in results]
+
+        if path.suffix == '.parquet':
+            import pandas as pd
+
+            pd.DataFrame(rows).to_parquet(path, engine='pyarrow', index=False)
+            return
+
+        with path.open('w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else [])
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def _to_row(result: SweepResult) -> dict[str, str | float]:
+    row: dict[str, str | float] = dict(result.params)
+    row['roi_pct'] = result.roi_pct
+
+    for game_type, report in result.reports.items():
+        prefix = game_type.name.lower()
+        row[f'{prefix}_hit_rate'] = report.basic_accuracy.hit_rate
+        row[f'{prefix}_average_hits_per_bet'] = report.basic_accuracy.average_hits_per_bet
+        row[f'{prefix}_total_winnings'] = report.monetary_metrics.total_winnings
+        row[f'{prefix}_net_profit'] = report.monetary_metrics.net_profit
+        row[f'{prefix}_roi_pct'] = report.monetary_metrics.roi_pct
+
+    return row
@@ -1,60 +1,217 @@
+from pathlib import Path
+
+import numpy as np
 import plotly.graph_objects as go
+from plotly.colors import qualitative
 from plotly.subplots import make_subplots
 
-from .core import GameRecord, GameType
+from .core import AbstractStrategy, GameType
 
 BACKGROUND_COLOR = '#111111'
 DEFAULT_CONFIG = {'displaylogo': False}
 JAVASCRIPT = f'''document.body.style.backgroundColor = "{BACKGROUND_COLOR}"; document.title = "Lotto Results";'''
 TEMPLATE = 'plotly_dark'
 
+MAX_POINTS = 2000
+ROLLING_WINDOW = 100
 
-def visualise_results(history: list[GameRecord], strategy_name: str) -> None:
-    fig = make_subplots(rows=2, shared_xaxes=True)
+_PERIOD_UNITS = {'week': 'W', 'month': 'M', 'year': 'Y'}
+_MATCH_LEVELS = (('1 match', 1, 2), ('2 matches', 2, 3), ('3+ matches', 3, 7))
+_GAMES = ((GameType.LOTTO, 'lotto'), (GameType.LOTTO_PLUS, 'lotto plus'))
+
+
+def visualise_results(
+    draw_dates: np.ndarray,
+    matches: dict[GameType, np.ndarray],
+    strategy_name: str,
+    resolution: str = 'auto',
+    output: Path | None = None,
+    max_points: int = MAX_POINTS,
+) -> None:
+    fig = build_figure(draw_dates, matches, strategy_name, resolution, max_points)
+    _render(fig, output)
+
+
+def build_figure(
+    draw_dates: np.ndarray,
+    matches: dict[GameType, np.ndarray],
+    strategy_name: str,
+    resolution: str = 'auto',
+    max_points: int = MAX_POINTS,
+) -> go.Figure:
+    resolution = _pick_resolution(draw_dates, resolution, max_points)
+    fig = make_subplots(rows=2, shared_xaxes=True, specs=[[{'secondary_y': True}], [{'secondary_y': True}]])
 
     fig.update_layout(
         hovermode='x unified',
         title=f'<b>Lotto & Lotto Plus draw results - {strategy_name}</b>',
         legend={'groupclick': 'toggleitem'},
         xaxis2_title='draw date',
-        yaxis1_title='lotto matches',
-        yaxis2_title='lotto plus matches',
-        yaxis1_range=[0, 6],
-        yaxis2_range=[0, 6],
+        barmode='stack',
+        template=TEMPLATE,
+        paper_bgcolor=BACKGROUND_COLOR,
+        showlegend=resolution != 'draw',
+    )
+
+    for row, (game_type, label) in enumerate(_GAMES, start=1):
+        game_matches = matches[game_type]
+
+        if resolution == 'draw':
+            _add_draw_traces(fig, row, draw_dates, game_matches, label)
+        else:
+            _add_period_traces(fig, row, draw_dates, game_matches, label, resolution)
+
+        fig.update_yaxes(title_text=f'{label} rolling average', secondary_y=True, row=row, col=1)
+
+    return fig
+
+
+def visualise_comparison(
+    draw_dates: np.ndarray,
+    matches: dict[str, dict[GameType, np.ndarray]],
+    resolution: str = 'auto',
+    output: Path | None = None,
+    max_points: int = MAX_POINTS,
+) -> None:
+    fig = build_comparison_figure(draw_dates, matches, resolution, max_points)
+    _render(fig, output)
+
+
+def build_comparison_figure(
+    draw_dates: np.ndarray,
+    matches: dict[str, dict[GameType, np.ndarray]],
+    resolution: str = 'auto',
+    max_points: int = MAX_POINTS,
+) -> go.Figure:
+    resolution = _pick_resolution(draw_dates, resolution, max_points)
+    points = np.arange(len(draw_dates)) if resolution == 'draw' else _period_ends(draw_dates, resolution)
+    fig = make_subplots(rows=2, shared_xaxes=True)
+
+    fig.update_layout(
+        hovermode='x unified',
+        title=f'<b>Lotto & Lotto Plus rolling average matches - {", ".join(matches)}</b>',
+        xaxis2_title='draw date',
         template=TEMPLATE,
         paper_bgcolor=BACKGROUND_COLOR,
-        showlegend=False,
     )
 
-    lotto_history = [record for record in history if record.game_type == GameType.LOTTO]
-    plus_history = [record for record in history if record.game_type == GameType.LOTTO_PLUS]
+    for row, (game_type, label) in enumerate(_GAMES, start=1):
+        for i, (strategy_name, strategy_matches) in enumerate(matches.items()):
+            fig.add_trace(
+                go.Scattergl(
+                    x=draw_dates[points],
+                    y=rolling_average(strategy_matches[game_type])[points],
+                    mode='lines',
+                    name=strategy_name,
+                    legendgroup=strategy_name,
+                    showlegend=row == 1,
+                    line={'color': qualitative.Plotly[i % len(qualitative.Plotly)]},
+                ),
+                row=row,
+                col=1,
+            )
+
+        fig.update_yaxes(title_text=f'{label} rolling average', row=row, col=1)
+
+    return fig
 
+
+def aggregate_matches(draw_dates: np.ndarray, matches: np.ndarray, resolution: str) -> tuple[np.ndarray, np.ndarray]:
+    periods = draw_dates.astype(f'datetime64[{_PERIOD_UNITS[resolution]}]')
+    starts, inverse = np.unique(periods, return_inverse=True)
+    levels = AbstractStrategy.TAKE + 1
+    histogram = np.bincount(inverse * levels + matches.astype(np.intp), minlength=len(starts) * levels)
+
+    return starts.astype('datetime64[D]'), histogram.reshape(len(starts), levels)
+
+
+def rolling_average(values: np.ndarray, window: int = ROLLING_WINDOW) -> np.ndarray:
+    cumulative = np.concatenate(([0], np.cumsum(values, dtype=np.int64)))
+    end = np.arange(1, len(values) + 1)
+    start = np.maximum(end - window, 0)
+
+    return (cumulative[end] - cumulative[start]) / (end - start)
+
+
+def _pick_resolution(draw_dates: np.ndarray, resolution: str, max_points: int) -> str:
+    candidates = ['draw', *_PERIOD_UNITS]
+    candidates = candidates[candidates.index(resolution) :] if resolution in candidates else candidates
+
+    # the requested resolution unless it would exceed the cap, then the next coarser one that fits
+    for candidate in candidates[:-1]:
+        if candidate == 'draw':
+            points = len(draw_dates)
+        else:
+            points = len(np.unique(draw_dates.astype(f'datetime64[{_PERIOD_UNITS[candidate]}]')))
+
+        if points <= max_points:
+            return candidate
+
+    return candidates[-1]
+
+
+def _add_draw_traces(fig: go.Figure, row: int, draw_dates: np.ndarray, matches: np.ndarray, label: str) -> None:
+    fig.add_trace(go.Bar(x=draw_dates, y=matches, name=f'{label} matches'), row=row, col=1)
     fig.add_trace(
-        go.Bar(
-            x=[record.draw_date for record in lotto_history],
-            y=[record.matches for record in lotto_history],
-            name='lotto matches',
-        ),
-        row=1,
+        go.Scattergl(x=draw_dates, y=rolling_average(matches), mode='lines', name=f'{label} rolling average'),
+        row=row,
         col=1,
+        secondary_y=True,
     )
+    fig.update_yaxes(title_text=f'{label} matches', range=[0, 6], secondary_y=False, row=row, col=1)
+
+    day_as_ms = 86400000
+    years_range = draw_dates.max().item().year - draw_dates.min().item().year
+
+    if years_range > 2:
+        fig.update_traces(width=day_as_ms * years_range / 2, selector={'type': 'bar'})
+
+
+def _add_period_traces(
+    fig: go.Figure, row: int, draw_dates: np.ndarray, matches: np.ndarray, label: str, resolution: str
+) -> None:
+    starts, histogram = aggregate_matches(draw_dates, matches, resolution)
+
+    for name, low, high in _MATCH_LEVELS:
+        fig.add_trace(
+            go.Bar(
+                x=starts,
+                y=histogram[:, low:high].sum(axis=1),
+                name=name,
+                legendgroup=name,
+                showlegend=row == 1,
+            ),
+            row=row,
+            col=1,
+        )
+
+    period_ends = _period_ends(draw_dates, resolution)
 
     fig.add_trace(
-        go.Bar(
-            x=[record.draw_date for record in plus_history],
-            y=[record.matches for record in plus_history],
-            name='plus matches',
+        go.Scattergl(
+            x=draw_dates[period_ends],
+            y=rolling_average(matches)[period_ends],
+            mode='lines',
+            name=f'{label} rolling average',
         ),
-        row=2,
+        row=row,
         col=1,
+        secondary_y=True,
     )
+    fig.update_yaxes(title_text=f'{label} games with hits per {resolution}', secondary_y=False, row=row, col=1)
 
-    day_as_ms = 86400000
-    min_date = min([record.draw_date for record in history])
-    max_date = max([record.draw_date for record in history])
-    years_range = max_date.year - min_date.year
 
-    if years_range > 2:
-        fig.update_traces(width=day_as_ms * years_range / 2)
+def _period_ends(draw_dates: np.ndarray, resolution: str) -> np.ndarray:
+    # one rolling average point per period, taken at its last draw
+    periods = draw_dates.astype(f'datetime64[{_PERIOD_UNITS[resolution]}]')
+    return np.flatnonzero(np.append(periods[1:] != periods[:-1], True))
+
 
-    fig.show(config=DEFAULT_CONFIG, post_script=[JAVASCRIPT])
+def _render(fig: go.Figure, output: Path | None) -> None:
+    if output is None:
+        fig.show(config=DEFAULT_CONFIG, post_script=[JAVASCRIPT])
+    elif output.suffix == '.html':
+        fig.write_html(output, config=DEFAULT_CONFIG, include_plotlyjs='cdn', post_script=[JAVASCRIPT])
+    else:
+        # static images go through kaleido, which plotly imports on demand
+        fig.write_image(output)
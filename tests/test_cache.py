@@ -0,0 +1,35 @@
+from pathlib import Path
+
+import pytest
+
+from lotto.benchmarks.synthetic import generate_store
+from lotto.cache import StateCache
+from lotto.strategies.hot_numbers import HotNumbers
+
+
+def _read_only(*_: object, **__: object) -> None:
+    raise PermissionError('read-only file system')
+
+
+def test_unwritable_cache_dir_falls_back_to_preparing(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(Path, 'mkdir', _read_only)
+    data = generate_store(300, seed=3)
+    expected = HotNumbers({})
+    expected.prepare_data(data)
+
+    cache = StateCache(tmp_path / 'strategies', 2**20)
+    strategy = HotNumbers({})
+    cache.prepare(strategy, 'hot-numbers', {}, data)
+
+    assert strategy.generate_numbers() == expected.generate_numbers()
+    assert not cache.entries()
+
+
+def test_failed_store_keeps_the_prepared_state(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = StateCache(tmp_path, 2**20)
+    monkeypatch.setattr(Path, 'open', _read_only)
+    strategy = HotNumbers({})
+    cache.prepare(strategy, 'hot-numbers', {}, generate_store(300, seed=3))
+
+    assert len(strategy.generate_numbers()) == HotNumbers.TAKE
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,28 @@
+import pytest
+
+from lotto.lotto_client import iter_json_array
+
+
+def _chunks(body: bytes, size: int) -> list[bytes]:
+    return [body[i : i + size] for i in range(0, len(body), size)]
+
+
+@pytest.mark.parametrize('size', [1, 7, 1024])
+def test_streams_array_items_across_chunks(size: int) -> None:
+    body = b' [ {"a": 1} , {"b": [2, 3]}, {"c": "]"} ]'
+
+    assert list(iter_json_array(_chunks(body, size))) == [{'a': 1}, {'b': [2, 3]}, {'c': ']'}]
+
+
+@pytest.mark.parametrize(
+    ('body', 'message'),
+    [
+        (b'{"error": "rate limited"}', "got '{'"),
+        (b'[{"a": 1}, [, {"b": 2}]', 'Unexpected end'),
+        (b'[{"a": 1}', 'missing "]"'),
+        (b'', 'got nothing'),
+    ],
+)
+def test_rejects_malformed_bodies(body: bytes, message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        list(iter_json_array(_chunks(body, 4)))
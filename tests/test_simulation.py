@@ -0,0 +1,44 @@
+from datetime import date
+
+import pytest
+
+from lotto.benchmarks.synthetic import generate_store
+from lotto.core import GameRecord, GameType
+from lotto.simulation import BacktestEngine, WalkSchedule, _RoiBounds
+from lotto.strategies.baseline import Baseline
+
+
+def _draws_until_stop(confidence: float, limit: int) -> int | None:
+    bounds = _RoiBounds(confidence, min_draws=500)
+    losing = [GameRecord(game_type, date(2000, 1, 1), [], [], 0) for game_type in GameType]
+
+    for draws in range(1, limit + 1):
+        if bounds.add(losing):
+            return draws
+
+    return None
+
+
+def test_higher_confidence_stops_later() -> None:
+    stops = [_draws_until_stop(confidence, 200_000) for confidence in (0.5, 0.9, 0.99)]
+
+    assert stops[0] is not None
+    assert stops[1] is not None
+    assert stops[0] < stops[1]
+    # a run of nothing but losses is still no proof against a jackpot this early
+    assert stops[0] > 500
+    assert stops[2] is None or stops[2] > stops[1]
+
+
+@pytest.mark.parametrize('confidence', [0.5, 0.99, 0.9999])
+def test_random_strategy_is_not_stopped_on_a_few_thousand_draws(confidence: float) -> None:
+    data = generate_store(5_000, seed=1)
+    strategy = Baseline()
+    strategy.seed(0)
+    engine = BacktestEngine(strategy, keep_history=False, schedule=WalkSchedule(stop_confidence=confidence))
+
+    for _ in engine.results_gen(data):
+        pass
+
+    assert not engine.stopped_early
+    assert engine.scored == slice(0, len(data))
@@ -0,0 +1,39 @@
+import pytest
+
+from lotto.benchmarks.synthetic import generate_store
+from lotto.core import AbstractStrategy, DrawStore
+from lotto.strategies.baseline import Baseline
+from lotto.strategies.hot_numbers import HotNumbers
+from lotto.strategies.wheel import Wheel
+
+
+class _Fixed(AbstractStrategy):
+    def prepare_data(self, _: DrawStore) -> None:
+        pass
+
+    def generate_numbers(self) -> list[int]:
+        return [1, 2, 3, 4, 5, 6]
+
+
+@pytest.mark.parametrize('strategy', [Baseline(), HotNumbers({}), Wheel({})], ids=type)
+@pytest.mark.parametrize('k', [2, 10, 500])
+def test_portfolio_tickets_are_distinct(strategy: AbstractStrategy, k: int) -> None:
+    strategy.seed(0)
+    strategy.prepare_data(generate_store(300, seed=2))
+    tickets = strategy.generate_tickets(k)
+
+    assert strategy.supports_tickets
+    assert len(tickets) == k
+    assert len({tuple(ticket) for ticket in tickets}) == k
+    assert all(len(set(ticket)) == AbstractStrategy.TAKE for ticket in tickets)
+
+
+def test_hot_numbers_portfolio_starts_with_its_single_ticket() -> None:
+    strategy = HotNumbers({})
+    strategy.prepare_data(generate_store(300, seed=2))
+
+    assert strategy.generate_tickets(3)[0] == strategy.generate_numbers()
+
+
+def test_single_ticket_strategy_does_not_claim_a_portfolio() -> None:
+    assert not _Fixed().supports_tickets